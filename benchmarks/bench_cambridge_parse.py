@@ -0,0 +1,101 @@
+"""Cambridge audio-link extraction: full-page BeautifulSoup vs. header slicing.
+
+Usage: python -m benchmarks.bench_cambridge_parse [page.html ...] [--pages N]
+
+Pass saved dictionary pages (e.g. ``curl -A Mozilla
+https://dictionary.cambridge.org/dictionary/english/run > run.html``) to
+measure real markup; without arguments synthetic pages with the same
+structure (navigation, several entries, long sense lists) are generated.
+"""
+import argparse
+import random
+import time
+
+import bs4
+
+from src.services.word_audio import extract_audio_links, parse_audio_links
+
+NAV = '<div class="hdn"><ul>' + "".join(f'<li><a href="/x/{i}">Link {i}</a></li>' for i in range(300)) + "</ul></div>"
+
+
+def synthetic_page(word: str, entries: int, senses: int, rng: random.Random) -> str:
+    parts = [f"<html><head><title>{word}</title>", "<script>var x = 1;</script>" * 20, "</head><body>", NAV]
+    for e in range(entries):
+        pos = rng.choice(["noun", "verb", "adjective"])
+        parts.append(f'<div class="pr entry-body__el"><div class="pos-header dpos-h">')
+        parts.append(f'<div class="di-title"><span class="hw dhw">{word}</span></div>')
+        parts.append(f'<div class="posgram dpos-g"><span class="pos dpos">{pos}</span></div>')
+        for region in ("uk", "us"):
+            parts.append(
+                f'<span class="{region} dpron-i "><span class="region dreg">{region}</span>'
+                f'<span class="daud"><audio><source type="audio/mpeg" '
+                f'src="/media/english/{region}_pron/{word[0]}/{word}{e}.mp3"/>'
+                f'<source type="audio/ogg" src="/media/english/{region}_pron_ogg/{word}{e}.ogg"/></audio></span>'
+                f'<span class="pron dpron">/{word}/</span></span>'
+            )
+        parts.append('</div><div class="pos-body">')
+        for s in range(senses):
+            parts.append(
+                f'<div class="pr dsense"><div class="def ddef_d db">meaning number {s} of {word} '
+                + "lorem ipsum " * rng.randint(5, 15)
+                + '</div><div class="examp dexamp"><span class="eg deg">'
+                + f"An example sentence using {word} in context. " * 2
+                + "</span></div></div>"
+            )
+        parts.append("</div></div>")
+    parts.append(NAV + "</body></html>")
+    return "".join(parts)
+
+
+def full_page_parse(content: str) -> tuple[list[str], list[str]]:
+    """The previous implementation: one soup for the whole page."""
+    soup = bs4.BeautifulSoup(content, "html.parser")
+    uk_links: list[str] = []
+    us_links: list[str] = []
+    for entry in soup.find_all("div", {"class": lambda x: x and "entry-body__el" in x}):
+        uk, us = parse_audio_links(entry.find("div", {"class": "dpos-h"}))
+        uk_links.extend(uk)
+        us_links.extend(us)
+    return list(dict.fromkeys(uk_links)), list(dict.fromkeys(us_links))
+
+
+def bench(fn, pages: list[str], repeat: int) -> float:
+    t = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            fn(page)
+    return (time.perf_counter() - t) / (repeat * len(pages)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pages", nargs="*")
+    parser.add_argument("--pages", dest="count", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    if args.pages:
+        pages = []
+        for path in args.pages:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+    else:
+        words = ["run", "set", "take", "light", "abandon", "fair", "present", "close", "record", "object"]
+        pages = [synthetic_page(words[i % len(words)], rng.randint(2, 5), rng.randint(10, 40), rng) for i in range(args.count)]
+
+    size = sum(map(len, pages)) / len(pages) / 1024
+    print(f"📦 {len(pages)} pages, {size:.0f} KB average")
+
+    for page in pages:
+        assert extract_audio_links(page) == full_page_parse(page), "results differ"
+    print("✅ Both parsers return the same links")
+
+    before = bench(full_page_parse, pages, args.repeat)
+    after = bench(extract_audio_links, pages, args.repeat)
+    print(f"🐢 Full-page soup:   {before:.2f} ms/page")
+    print(f"⚡ Header slicing:   {after:.2f} ms/page ({before / after:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
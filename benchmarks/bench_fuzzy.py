@@ -0,0 +1,75 @@
+"""Spelling index vs. a linear difflib scan.
+
+Usage: python -m benchmarks.bench_fuzzy [wordlist.txt] [--size N]
+
+Without a word list a synthetic vocabulary of pseudo-words is used.
+"""
+import argparse
+import difflib
+import random
+import time
+
+from src.utils.fuzzy import FuzzyIndex
+
+SYLLABLES = [
+    "ba", "con", "ter", "ing", "pro", "tion", "re", "de", "ment", "al", "ex", "pre", "ous", "ly", "ca",
+    "ri", "mo", "ne", "sta", "gra", "vi", "lo", "pe", "tu", "an", "en", "ar", "ful", "less", "is",
+]
+
+
+def synthetic_words(n: int, rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))))
+    return sorted(words)
+
+
+def typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    kind = rng.choice(("sub", "del", "ins", "swap"))
+    if kind == "sub":
+        return word[:i] + rng.choice("aeiourstln") + word[i + 1:]
+    if kind == "del" and len(word) > 3:
+        return word[:i] + word[i + 1:]
+    if kind == "swap" and i < len(word) - 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice("aeiourstln") + word[i:]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("wordlist", nargs="?")
+    parser.add_argument("--size", type=int, default=40000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    if args.wordlist:
+        with open(args.wordlist, encoding="utf-8") as f:
+            words = sorted({line.split()[0].lower() for line in f if line.strip()})
+    else:
+        words = synthetic_words(args.size, rng)
+    queries = [typo(w, rng) for w in rng.sample(words, args.queries)]
+    print(f"📦 {len(words)} words, {len(queries)} misspelled queries")
+
+    t = time.perf_counter()
+    index = FuzzyIndex(words)
+    print(f"🔨 Index build: {time.perf_counter() - t:.2f}s")
+
+    for max_distance in (1, 2):
+        t = time.perf_counter()
+        for q in queries:
+            index.lookup(q, max_distance)
+        per_query = (time.perf_counter() - t) / len(queries) * 1000
+        print(f"⚡ FuzzyIndex d≤{max_distance}: {per_query:.3f} ms/query")
+
+    sample = queries[:20]
+    t = time.perf_counter()
+    for q in sample:
+        difflib.get_close_matches(q, words, n=3, cutoff=0.8)
+    per_query = (time.perf_counter() - t) / len(sample) * 1000
+    print(f"🐢 difflib linear scan: {per_query:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
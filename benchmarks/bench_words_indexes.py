@@ -0,0 +1,114 @@
+"""Query plans and timings for the study-list queries, before and after the words indexes.
+
+Usage: python -m benchmarks.bench_words_indexes [--rows 2000000] [--db /tmp/words_bench.db]
+
+Seeds an SQLite database with the pre-migration schema, explains and times
+the due-queue, dictionary-page and "already studying?" queries, then adds the
+indexes from migration 5e8d2b4c9f17 and repeats. On MySQL, run the same
+statements with EXPLAIN against a copy of production.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE users (user_id BIGINT PRIMARY KEY, active BOOLEAN);
+CREATE TABLE dictionary (word VARCHAR(255) PRIMARY KEY, definition VARCHAR(1000), example VARCHAR(1000),
+    pronunciation VARCHAR(255), level VARCHAR(50), importance_rate VARCHAR(50), synonyms VARCHAR(500));
+CREATE TABLE words (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id BIGINT REFERENCES users(user_id),
+    word VARCHAR(255) REFERENCES dictionary(word), state VARCHAR(50), step INTEGER, next_review INTEGER,
+    interval INTEGER, ease_factor FLOAT);
+"""
+
+INDEXES = """
+CREATE INDEX ix_words_user_id_next_review ON words (user_id, next_review);
+CREATE UNIQUE INDEX uq_words_user_id_word ON words (user_id, word);
+"""
+
+QUERIES = {
+    "due queue (get_due_cards)": (
+        "SELECT w.id, w.next_review, d.word, d.level, d.pronunciation FROM words w "
+        "JOIN dictionary d ON w.word = d.word WHERE w.user_id = :user AND w.next_review <= :now "
+        "ORDER BY w.next_review, w.id LIMIT 20"
+    ),
+    "dictionary page (get_user_dictionary)": (
+        "SELECT w.*, d.* FROM words w JOIN dictionary d ON w.word = d.word "
+        "WHERE w.user_id = :user ORDER BY w.id DESC LIMIT 5 OFFSET 0"
+    ),
+    "already studying? (add_to_study_list)": (
+        "SELECT id FROM words WHERE user_id = :user AND word = :word"
+    ),
+}
+
+
+def seed(conn: sqlite3.Connection, rows: int, words_per_user: int, vocabulary: int):
+    rng = random.Random(42)
+    users = rows // words_per_user
+    now = int(time.time())
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO users VALUES (?, 1)", ((u,) for u in range(users)))
+    conn.executemany(
+        "INSERT INTO dictionary VALUES (?, 'd', 'e', '/p/', 'B2', '5', '')",
+        ((f"word{i}",) for i in range(vocabulary)),
+    )
+
+    def word_rows():
+        for user in range(users):
+            for w in rng.sample(range(vocabulary), words_per_user):
+                yield user, f"word{w}", "review", 0, now + rng.randint(-86400 * 30, 86400 * 30), 1, 2.5
+
+    conn.executemany(
+        "INSERT INTO words (user_id, word, state, step, next_review, interval, ease_factor) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        word_rows(),
+    )
+    conn.commit()
+    return users
+
+
+def report(conn: sqlite3.Connection, users: int, label: str, samples: int = 200):
+    rng = random.Random(7)
+    print(f"\n── {label} ──")
+    params = {"user": users // 2, "now": int(time.time()), "word": "word1"}
+    for name, sql in QUERIES.items():
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        t = time.perf_counter()
+        for _ in range(samples):
+            params["user"] = rng.randrange(users)
+            conn.execute(sql, params).fetchall()
+        per_query = (time.perf_counter() - t) / samples * 1000
+        print(f"{name}: {per_query:.3f} ms")
+        for step in plan:
+            print(f"    {step}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--words-per-user", type=int, default=100)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--db", default="/tmp/words_bench.db")
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    conn = sqlite3.connect(args.db)
+
+    t = time.perf_counter()
+    users = seed(conn, args.rows, args.words_per_user, args.vocabulary)
+    print(f"📦 Seeded {args.rows} study rows for {users} users in {time.perf_counter() - t:.1f}s")
+
+    report(conn, users, "before (no indexes)", samples=5)
+
+    t = time.perf_counter()
+    conn.executescript(INDEXES)
+    print(f"\n🔨 Index build: {time.perf_counter() - t:.1f}s")
+
+    report(conn, users, "after (migration 5e8d2b4c9f17)")
+    conn.close()
+    os.remove(args.db)
+
+
+if __name__ == "__main__":
+    main()
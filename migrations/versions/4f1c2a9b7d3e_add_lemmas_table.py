@@ -0,0 +1,33 @@
+"""add lemmas table
+
+Revision ID: 4f1c2a9b7d3e
+Revises: 83ff03e008d3
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1c2a9b7d3e'
+down_revision: Union[str, Sequence[str], None] = '83ff03e008d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'lemmas',
+        sa.Column('form', sa.String(length=255), nullable=False),
+        sa.Column('lemma', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('form'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('lemmas')
@@ -0,0 +1,38 @@
+"""add words indexes
+
+Revision ID: 5e8d2b4c9f17
+Revises: c3a7e1f05b92
+Create Date: 2026-10-18 16:21:09.573184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8d2b4c9f17'
+down_revision: Union[str, Sequence[str], None] = 'c3a7e1f05b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The old SELECT-then-INSERT could race into duplicates; keep the oldest row
+    # of each (user_id, word) so the unique index can be built. The derived
+    # table keeps MySQL from rejecting a subquery on the table being deleted from.
+    op.execute(sa.text(
+        "DELETE FROM words WHERE id NOT IN ("
+        "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM words GROUP BY user_id, word) AS keep"
+        ")"
+    ))
+    op.create_index('ix_words_user_id_next_review', 'words', ['user_id', 'next_review'], unique=False)
+    op.create_index('uq_words_user_id_word', 'words', ['user_id', 'word'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_words_user_id_word', table_name='words')
+    op.drop_index('ix_words_user_id_next_review', table_name='words')
@@ -0,0 +1,35 @@
+"""add missed words table
+
+Revision ID: 9b2e5d71c4a8
+Revises: 4f1c2a9b7d3e
+Create Date: 2026-10-18 13:47:05.881342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e5d71c4a8'
+down_revision: Union[str, Sequence[str], None] = '4f1c2a9b7d3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'missed_words',
+        sa.Column('word', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('word'),
+    )
+    op.create_index(op.f('ix_missed_words_created_at'), 'missed_words', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_missed_words_created_at'), table_name='missed_words')
+    op.drop_table('missed_words')
@@ -0,0 +1,40 @@
+"""add review log table
+
+Revision ID: a7d3f60e2b18
+Revises: 5e8d2b4c9f17
+Create Date: 2026-10-18 19:26:12.538104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f60e2b18'
+down_revision: Union[str, Sequence[str], None] = '5e8d2b4c9f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'review_log',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_word_id', sa.Integer(), nullable=False),
+        sa.Column('ts', sa.Integer(), nullable=False),
+        sa.Column('grade', sa.SmallInteger(), nullable=False),
+        sa.Column('prev_interval', sa.Integer(), nullable=False),
+        sa.Column('new_interval', sa.Integer(), nullable=False),
+        sa.Column('ease', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_review_log_user_word_id'), 'review_log', ['user_word_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_review_log_user_word_id'), table_name='review_log')
+    op.drop_table('review_log')
@@ -0,0 +1,39 @@
+"""add reminder columns to users
+
+Revision ID: b9f2c4e81a07
+Revises: e41b9c7a3d56
+Create Date: 2026-10-18 21:58:04.731268
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9f2c4e81a07'
+down_revision: Union[str, Sequence[str], None] = 'e41b9c7a3d56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('next_due', sa.Integer(), nullable=True))
+    op.add_column('users', sa.Column('last_reminded', sa.Integer(), nullable=True))
+    op.add_column('users', sa.Column('utc_offset', sa.SmallInteger(), nullable=True))
+    # One-off backfill; from here on the bot keeps next_due up to date
+    op.execute(
+        "UPDATE users SET next_due = "
+        "(SELECT MIN(words.next_review) FROM words WHERE words.user_id = users.user_id)"
+    )
+    op.create_index('ix_users_active_next_due', 'users', ['active', 'next_due'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_active_next_due', table_name='users')
+    op.drop_column('users', 'utc_offset')
+    op.drop_column('users', 'last_reminded')
+    op.drop_column('users', 'next_due')
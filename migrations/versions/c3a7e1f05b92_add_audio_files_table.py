@@ -0,0 +1,36 @@
+"""add audio files table
+
+Revision ID: c3a7e1f05b92
+Revises: 9b2e5d71c4a8
+Create Date: 2026-10-18 15:02:41.406217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a7e1f05b92'
+down_revision: Union[str, Sequence[str], None] = '9b2e5d71c4a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'audio_files',
+        sa.Column('word', sa.String(length=255), nullable=False),
+        sa.Column('accent', sa.String(length=8), nullable=False),
+        sa.Column('source', sa.String(length=16), nullable=False),
+        sa.Column('file_id', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('word', 'accent', 'source'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('audio_files')
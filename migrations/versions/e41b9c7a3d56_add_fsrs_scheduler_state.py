@@ -0,0 +1,40 @@
+"""add fsrs scheduler state
+
+Revision ID: e41b9c7a3d56
+Revises: a7d3f60e2b18
+Create Date: 2026-10-18 20:41:37.162950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b9c7a3d56'
+down_revision: Union[str, Sequence[str], None] = 'a7d3f60e2b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('words', sa.Column('stability', sa.Float(), nullable=True))
+    op.add_column('words', sa.Column('difficulty', sa.Float(), nullable=True))
+    op.create_table(
+        'scheduler_params',
+        sa.Column('user_id', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('weights', sa.String(length=1000), nullable=False),
+        sa.Column('reviews', sa.Integer(), nullable=False),
+        sa.Column('loss', sa.Float(), nullable=False),
+        sa.Column('fitted_at', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scheduler_params')
+    op.drop_column('words', 'difficulty')
+    op.drop_column('words', 'stability')
@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+from sqlalchemy import select
+
+from .database import init_db, replace_lemma_index
+from .database.engine import AsyncSessionLocal, engine
+from .database.models import Dictionary
+from .utils.inflect import build_lemma_index
+
+# Usage: python -m src.build_lemmas wordlist.txt
+# The word list is one lemma per line (e.g. the top 20k English lemmas).
+# Existing dictionary headwords are always included as lemmas, so words
+# that already have their own row keep resolving to it.
+
+
+def read_word_list(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.split()[0].lower() for line in f if line.strip() and not line.startswith("#")]
+
+
+async def main(path: str):
+    await init_db()
+
+    lemmas = read_word_list(path)
+    async with AsyncSessionLocal() as session:
+        headwords = list((await session.execute(select(Dictionary.word))).scalars())
+    print(f"📦 {len(lemmas)} lemmas from {path}, {len(headwords)} dictionary headwords")
+
+    index = build_lemma_index([*lemmas, *headwords])
+    print(f"⏳ Writing {len(index)} inflected forms...")
+    await replace_lemma_index(index)
+
+    print("🎉 Lemma index rebuilt!")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the inflection → lemma index")
+    parser.add_argument("wordlist", help="file with one lemma per line")
+    args = parser.parse_args()
+    asyncio.run(main(args.wordlist))
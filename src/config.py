@@ -7,6 +7,93 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     ADMIN_ID: int = 7853044770
 
+    # In-process definition cache in front of the dictionary table
+    DEFINITION_CACHE_SIZE: int = 5000
+    DEFINITION_CACHE_TTL: int = 0   # seconds, 0 = never expire
+
+    # Words the LLM could not define are not asked about again for a while
+    NEGATIVE_CACHE_SIZE: int = 20000
+    NEGATIVE_CACHE_TTL: int = 7 * 24 * 3600
+
+    # New users are queued in memory and inserted in batches this often
+    USER_FLUSH_INTERVAL: float = 2.0   # seconds
+
+    # Quiz grades are applied in memory and written in batches; a flush runs
+    # every interval, or sooner once this many cards are waiting
+    GRADE_FLUSH_INTERVAL: float = 2.0  # seconds
+    GRADE_FLUSH_SIZE: int = 200
+
+    # Spaced repetition: "sm2" (fixed constants) or "fsrs" (weights fitted by
+    # python -m src.fit_scheduler); FSRS picks intervals for this recall chance
+    SCHEDULER: str = "sm2"
+    FSRS_RETENTION: float = 0.9
+
+    # Reminders for users whose cards are due; quiet hours are in the user's
+    # local time (/timezone), REMINDER_UTC_OFFSET for users who never set one
+    REMINDER_INTERVAL: int = 60                 # seconds between scans, 0 = no reminders
+    REMINDER_RATE: int = 20                     # messages per second (Telegram allows ~30)
+    REMINDER_MIN_GAP: int = 20 * 3600           # seconds between two reminders to one user
+    REMINDER_IDLE: int = 2 * 3600               # don't remind someone who used the bot this recently
+    REMINDER_QUIET_START: int = 22              # local hour
+    REMINDER_QUIET_END: int = 9
+    REMINDER_UTC_OFFSET: int = 5 * 60           # minutes (Tashkent)
+    REMINDER_RESCAN: int = 3600                 # seconds between passes over everyone with cards due
+
+    # Channel subscription checks (getChatMember) are cached per user
+    SUBSCRIPTION_CACHE_SIZE: int = 50000
+    SUBSCRIPTION_TTL: int = 15 * 60             # seconds a "member" answer is trusted
+    SUBSCRIPTION_NEGATIVE_TTL: int = 30         # seconds a "not a member" answer is trusted
+    SUBSCRIPTION_REFRESH_INTERVAL: int = 0      # seconds, 0 = off; keep below SUBSCRIPTION_TTL
+    SUBSCRIPTION_ACTIVE_WINDOW: int = 30 * 60   # users seen this recently get refreshed
+
+    # Telegram file_ids of uploaded pronunciation audio kept in memory
+    AUDIO_FILE_CACHE_SIZE: int = 20000
+
+    # Generated TTS audio is stored on disk, content-addressed, with an LRU size cap
+    AUDIO_STORE_DIR: str = "audio_store"
+    AUDIO_STORE_MAX_MB: int = 1024
+    TTS_WORKERS: int = 4        # threads reserved for gTTS
+    TTS_MAX_QUEUE: int = 32     # jobs waiting for a worker before new ones are refused
+
+    # Shared outbound HTTP client (Cambridge scraper, audio downloads)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_PER_HOST: int = 10
+    HTTP_DNS_CACHE_TTL: int = 300       # seconds
+    HTTP_KEEPALIVE: float = 30.0        # seconds an idle connection is kept
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+
+    # Due cards fetched per query while reviewing
+    QUIZ_PAGE_SIZE: int = 20
+
+    # Pronunciation audio generated in the background after a search
+    PREFETCH_CONCURRENCY: int = 2
+    PREFETCH_MAX_PENDING: int = 100     # scheduled prefetches before new ones are dropped
+    PREFETCH_MAX_AGE: float = 30.0      # seconds; older ones are skipped, the user moved on
+
+    # Cambridge audio links scraped per word
+    WORD_AUDIO_CACHE_SIZE: int = 10000
+    WORD_AUDIO_CACHE_TTL: int = 24 * 3600
+
+    # LLM providers: OpenAI first, Groq as hedge/failover when a key is set
+    OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_BASE_URL: str | None = None
+    GROQ_API_KEY: SecretStr | None = None
+    GROQ_MODEL: str = "llama-3.1-8b-instant"
+    GROQ_BASE_URL: str | None = None
+    LLM_HEDGING: bool = True
+
+    # LLM request governor (per provider)
+    LLM_MAX_CONCURRENT: int = 8
+    LLM_RPM: int = 500              # requests per minute
+    LLM_TPM: int = 200_000          # tokens per minute
+    LLM_MAX_QUEUE: int = 50         # waiting requests before new ones are shed
+    LLM_QUEUE_TIMEOUT: float = 10.0 # seconds a request may wait for its slot
+
+    # Stream LLM answers into the "Searching..." message as they arrive
+    LLM_STREAMING: bool = True
+    STREAM_EDIT_INTERVAL: float = 1.5   # seconds between Telegram edits
+
     model_config = SettingsConfigDict(
         env_file=".env", 
         env_file_encoding="utf-8",
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from aiogram import Bot, Dispatcher
 from aiogram.client.bot import DefaultBotProperties
 from aiogram.enums import ParseMode
@@ -5,6 +7,7 @@ from aiogram.types import InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from ..config import settings
+from ..utils import SingleFlight, TTLCache
 
 bot = Bot(
     token=settings.BOT_TOKEN.get_secret_value(),
@@ -14,16 +17,88 @@ dp = Dispatcher()
 
 CHANNEL_ID = "@akbarshokh_blogs"
 CHANNEL_USERNAME = "akbarshokh_blogs"
+REFRESH_PAUSE = 0.05   # seconds between background checks, keeps well under Bot API limits
 
 
-async def is_subscribed(user_id: int) -> bool:
+# Membership answers are cached per user: members for a while, non-members
+# only briefly so someone who just joined is let in quickly
+_subscription_cache = TTLCache(settings.SUBSCRIPTION_CACHE_SIZE)
+_subscription_checks = SingleFlight()
+_last_seen: dict[int, float] = {}   # user_id -> monotonic time of last check, oldest first
+_subscription_stats = {"api_calls": 0, "api_errors": 0, "refreshed": 0}
+
+
+async def _check_membership(user_id: int) -> bool | None:
+    _subscription_stats["api_calls"] += 1
     try:
         member = await bot.get_chat_member(CHANNEL_ID, user_id)
-        print(f"User {user_id} status: {member.status}")
-        return member.status in ("member", "administrator", "creator")
     except Exception as e:
+        _subscription_stats["api_errors"] += 1
         print(f"Subscription check error: {e}")
-        return True
+        return None
+
+    print(f"User {user_id} status: {member.status}")
+    subscribed = member.status in ("member", "administrator", "creator")
+    ttl = settings.SUBSCRIPTION_TTL if subscribed else settings.SUBSCRIPTION_NEGATIVE_TTL
+    _subscription_cache.set(user_id, subscribed, ttl=ttl)
+    return subscribed
+
+
+def _note_seen(user_id: int):
+    """Only the refresher reads _last_seen; drop users past the active window as we go."""
+    if not settings.SUBSCRIPTION_REFRESH_INTERVAL:
+        return
+    now = time.monotonic()
+    _last_seen.pop(user_id, None)   # re-insert at the end, so the dict stays in last-seen order
+    _last_seen[user_id] = now
+    cutoff = now - settings.SUBSCRIPTION_ACTIVE_WINDOW
+    while _last_seen:
+        oldest = next(iter(_last_seen))
+        if _last_seen[oldest] >= cutoff and len(_last_seen) <= settings.SUBSCRIPTION_CACHE_SIZE:
+            break
+        del _last_seen[oldest]
+
+
+async def is_subscribed(user_id: int) -> bool:
+    _note_seen(user_id)
+    subscribed = _subscription_cache.get(user_id)
+    if subscribed is None:
+        subscribed = await _subscription_checks.do(user_id, _check_membership, user_id)
+    if subscribed is None:
+        return True  # fail open, and don't cache it: ask again next time
+    return subscribed
+
+
+def forget_subscription(user_id: int):
+    _subscription_cache.pop(user_id)
+
+
+async def run_subscription_refresher():
+    """Re-check recently active users before their entry expires, so they never wait on it."""
+    interval = settings.SUBSCRIPTION_REFRESH_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        cutoff = time.monotonic() - settings.SUBSCRIPTION_ACTIVE_WINDOW
+        for user_id, seen in list(_last_seen.items()):
+            if seen < cutoff:
+                del _last_seen[user_id]
+                continue
+            if _subscription_cache.get(user_id, count=False):  # only members; others expire soon anyway
+                await _subscription_checks.do(user_id, _check_membership, user_id)
+                _subscription_stats["refreshed"] += 1
+                await asyncio.sleep(REFRESH_PAUSE)
+
+
+def get_subscription_stats() -> dict:
+    cache = _subscription_cache.stats()
+    return {
+        **cache,
+        **_subscription_stats,
+        "coalesced": _subscription_checks.coalesced,
+        "active_users": len(_last_seen),
+        # each cache hit or joined in-flight check is one get_chat_member not sent
+        "api_calls_saved": cache["hits"] + _subscription_checks.coalesced,
+    }
 
 
 def subscribe_kb() -> InlineKeyboardMarkup:
@@ -0,0 +1,52 @@
+from typing import Any, Awaitable, Callable
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+from aiogram.types import TelegramObject, User
+
+from ..database import unit_of_work, release_session, touch_user
+
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """Runs every update inside one database session, committed when the handler returns."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        async with unit_of_work():
+            return await handler(event, data)
+
+
+class ActivityMiddleware(BaseMiddleware):
+    """Notes when each user last sent an update, so reminders leave active users alone."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        if user is not None:
+            touch_user(user.id)
+        return await handler(event, data)
+
+
+class ReleaseSessionMiddleware(BaseRequestMiddleware):
+    """Commits the handler's unit of work before every Bot API call.
+
+    The user only sees "✅ Added" once the row is committed, and the session's
+    connection goes back to the pool instead of waiting on Telegram.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ) -> Response:
+        await release_session()
+        return await make_request(bot, method)
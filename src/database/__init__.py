@@ -1,12 +1,74 @@
-from .engine import init_db, Base
-from .users import add_user
+from .engine import (
+    init_db,
+    insert_ignore,
+    insert_skip_duplicate,
+    unit_of_work,
+    session_scope,
+    release_session,
+    get_session_stats,
+    Base,
+)
+from .users import (
+    load_known_users,
+    add_user,
+    flush_new_users,
+    ensure_user_saved,
+    touch_user,
+    last_active,
+    prune_last_active,
+    run_user_flusher,
+    get_user_registry_stats,
+)
 from .dictionary import (
     save_to_global_dict,
+    bulk_save_to_global_dict,
+    get_existing_words,
+    get_all_words,
     get_cached_definition,
+    get_definition_cache_stats,
+    load_fuzzy_index,
+    suggest_words,
     add_to_study_list,
     get_user_dictionary,
 )
-from .quiz import get_due_words, get_study_details, update_anki_progress
+from .lemmas import load_lemma_index, resolve_lemma, replace_lemma_index
+from .misses import (
+    load_negative_cache,
+    is_known_miss,
+    remember_miss,
+    forget_miss,
+    forget_misses,
+    get_negative_cache_stats,
+)
+from .audio import (
+    get_audio_file_id,
+    save_audio_file_id,
+    forget_audio_file_id,
+    get_audio_stats,
+)
+from .grades import (
+    REVIEW_GRADES,
+    flush_grades,
+    run_grade_flusher,
+    iter_review_log,
+    get_grade_buffer_stats,
+)
+from .scheduler import (
+    Scheduler,
+    SM2Scheduler,
+    FSRSScheduler,
+    get_scheduler,
+    load_scheduler_params,
+    save_scheduler_params,
+)
+from .reminders import (
+    iter_due_users,
+    get_due_users,
+    count_due_cards,
+    mark_reminded,
+    set_utc_offset,
+)
+from .quiz import get_due_words, get_due_cards, get_study_details, update_anki_progress
 from .admin import (
     get_stats,
     get_all_user_ids,
@@ -15,12 +77,62 @@ from .admin import (
 
 __all__ = [
     "init_db",
+    "insert_ignore",
+    "insert_skip_duplicate",
+    "unit_of_work",
+    "session_scope",
+    "release_session",
+    "get_session_stats",
+    "load_known_users",
     "add_user",
+    "flush_new_users",
+    "ensure_user_saved",
+    "touch_user",
+    "last_active",
+    "prune_last_active",
+    "run_user_flusher",
+    "get_user_registry_stats",
     "save_to_global_dict",
+    "bulk_save_to_global_dict",
+    "get_existing_words",
+    "get_all_words",
     "get_cached_definition",
+    "get_definition_cache_stats",
+    "load_fuzzy_index",
+    "suggest_words",
     "add_to_study_list",
     "get_user_dictionary",
+    "load_lemma_index",
+    "resolve_lemma",
+    "replace_lemma_index",
+    "load_negative_cache",
+    "is_known_miss",
+    "remember_miss",
+    "forget_miss",
+    "forget_misses",
+    "get_negative_cache_stats",
+    "get_audio_file_id",
+    "save_audio_file_id",
+    "forget_audio_file_id",
+    "get_audio_stats",
+    "REVIEW_GRADES",
+    "flush_grades",
+    "run_grade_flusher",
+    "iter_review_log",
+    "get_grade_buffer_stats",
+    "Scheduler",
+    "SM2Scheduler",
+    "FSRSScheduler",
+    "get_scheduler",
+    "load_scheduler_params",
+    "save_scheduler_params",
+    "iter_due_users",
+    "get_due_users",
+    "count_due_cards",
+    "mark_reminded",
+    "set_utc_offset",
     "get_due_words",
+    "get_due_cards",
     "get_study_details",
     "update_anki_progress",
     "get_stats",
@@ -1,8 +1,10 @@
 from sqlalchemy import select, func, update
 from .engine import AsyncSessionLocal
 from .models import User, Dictionary, UserWord
+from .users import flush_new_users
 
 async def get_stats() -> dict:
+    await flush_new_users()  # count users still waiting in the queue
     async with AsyncSessionLocal() as session:
         total_users = await session.scalar(select(func.count()).select_from(User))
         active_users = await session.scalar(select(func.count()).select_from(User).where(User.active == True))
@@ -16,6 +18,7 @@ async def get_stats() -> dict:
 
 
 async def get_all_user_ids() -> list[int]:
+    await flush_new_users()
     async with AsyncSessionLocal() as session:
         result = await session.execute(
             select(User.user_id)
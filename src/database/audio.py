@@ -0,0 +1,51 @@
+import time
+from ..config import settings
+from ..utils import TTLCache
+from .engine import session_scope
+from .models import AudioFile
+
+# Telegram file_id of audio we already uploaded, keyed by (word, accent, source);
+# sending by file_id needs no upload and no TTS
+_file_id_cache = TTLCache(settings.AUDIO_FILE_CACHE_SIZE)
+_audio_stats = {"reused": 0, "uploaded": 0, "invalidated": 0}
+
+
+async def get_audio_file_id(word: str, accent: str, source: str, count: bool = True) -> str | None:
+    """Telegram's file_id for this audio; ``count=False`` for lookups that send nothing."""
+    key = (word, accent, source)
+    file_id = _file_id_cache.get(key, count=count)
+    if file_id is None:
+        async with session_scope() as session:
+            row = await session.get(AudioFile, key)
+        if row is None:
+            return None
+        file_id = row.file_id
+        _file_id_cache.set(key, file_id)
+
+    if count:
+        _audio_stats["reused"] += 1
+    return file_id
+
+
+async def save_audio_file_id(word: str, accent: str, source: str, file_id: str):
+    _file_id_cache.set((word, accent, source), file_id)
+    _audio_stats["uploaded"] += 1
+    async with session_scope() as session:
+        await session.merge(AudioFile(
+            word=word, accent=accent, source=source, file_id=file_id, created_at=int(time.time()),
+        ))
+
+
+async def forget_audio_file_id(word: str, accent: str, source: str):
+    """Drop an id Telegram no longer accepts, so the next play uploads again."""
+    key = (word, accent, source)
+    _file_id_cache.pop(key)
+    _audio_stats["invalidated"] += 1
+    async with session_scope() as session:
+        row = await session.get(AudioFile, key)
+        if row is not None:
+            await session.delete(row)
+
+
+def get_audio_stats() -> dict:
+    return {**_audio_stats, **_file_id_cache.stats()}
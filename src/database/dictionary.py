@@ -1,71 +1,173 @@
+import asyncio
+import time
 from sqlalchemy import select
-from .engine import AsyncSessionLocal
+from ..config import settings
+from ..utils import TTLCache
+from ..utils.fuzzy import FuzzyIndex
+from .engine import AsyncSessionLocal, session_scope, insert_ignore, insert_skip_duplicate
 from .models import Dictionary, UserWord
+from .users import ensure_user_saved
+from .reminders import lower_next_due
+from .misses import is_known_miss, forget_miss, forget_misses
 
+# Hot words are served from memory; save_to_global_dict writes through
+_definition_cache = TTLCache(settings.DEFINITION_CACHE_SIZE, settings.DEFINITION_CACHE_TTL)
 
-async def save_to_global_dict(data: dict):
-    async with AsyncSessionLocal() as session:
-        word_text = data['word'].lower().strip()
+# Spelling index over every headword, kept in step by save_to_global_dict
+_fuzzy_index = FuzzyIndex()
+
+
+def _to_row(data: dict) -> dict:
+    syns = data.get('synonyms', '')
+    if isinstance(syns, list):
+        syns = ", ".join(syns)
+
+    return {
+        "word": data['word'].lower().strip(),
+        "definition": data['definition'],
+        "example": data['example'],
+        "pronunciation": data.get('pronunciation', ''),
+        "level": data.get('level', 'N/A'),
+        "importance_rate": data.get('importance_rate', '5/10'),
+        "synonyms": syns,
+    }
 
-        if await session.get(Dictionary, word_text):
+
+def _to_dict(entry: Dictionary) -> dict:
+    return {
+        "word": entry.word,
+        "definition": entry.definition,
+        "example": entry.example,
+        "pronunciation": entry.pronunciation,
+        "level": entry.level,
+        "importance_rate": entry.importance_rate,
+        "synonyms": entry.synonyms,
+    }
+
+
+async def save_to_global_dict(data: dict):
+    word_text = data['word'].lower().strip()
+    async with session_scope() as session:
+        existing = await session.get(Dictionary, word_text)
+        if existing:
+            _definition_cache.set(word_text, _to_dict(existing))
             return  # already cached
 
-        syns = data.get('synonyms', '')
-        if isinstance(syns, list):
-            syns = ", ".join(syns)
-
-        session.add(Dictionary(
-            word=word_text,
-            definition=data['definition'],
-            example=data['example'],
-            pronunciation=data.get('pronunciation', ''),
-            level=data.get('level', 'N/A'),
-            importance_rate=data.get('importance_rate', '5/10'),
-            synonyms=syns,
-        ))
+        entry = Dictionary(**_to_row(data))
+        session.add(entry)
+
+    _definition_cache.set(word_text, _to_dict(entry))
+    _fuzzy_index.add(word_text)
+    if is_known_miss(word_text):
+        await forget_miss(word_text)
+
+
+async def bulk_save_to_global_dict(entries: list[dict], chunk_size: int = 500) -> int:
+    """Insert many definitions at once, skipping words that already exist."""
+    rows = list({row["word"]: row for row in map(_to_row, entries)}.values())
+    inserted = 0
+
+    async with AsyncSessionLocal() as session:
+        for i in range(0, len(rows), chunk_size):
+            result = await session.execute(insert_ignore(Dictionary).values(rows[i:i + chunk_size]))
+            inserted += max(result.rowcount, 0)
         await session.commit()
 
+    for row in rows:
+        _fuzzy_index.add(row["word"])
+    # Same guard as save_to_global_dict: no DELETE for chunks without a known miss
+    missed = [row["word"] for row in rows if is_known_miss(row["word"], count=False)]
+    for i in range(0, len(missed), chunk_size):
+        await forget_misses(missed[i:i + chunk_size])
+    return inserted
 
-async def get_cached_definition(word: str) -> dict | None:
+
+async def get_existing_words(words: list[str], chunk_size: int = 1000) -> set[str]:
+    """Which of the given words already have a dictionary row (set-based, chunked)."""
+    existing: set[str] = set()
     async with AsyncSessionLocal() as session:
-        result = await session.get(Dictionary, word.lower().strip())
+        for i in range(0, len(words), chunk_size):
+            stmt = select(Dictionary.word).where(Dictionary.word.in_(words[i:i + chunk_size]))
+            existing.update((await session.execute(stmt)).scalars())
+    return existing
+
+
+async def get_cached_definition(word: str) -> dict | None:
+    word = word.lower().strip()
+
+    cached = _definition_cache.get(word)
+    if cached is not None:
+        return dict(cached)  # callers may mutate their copy
+
+    async with session_scope() as session:
+        result = await session.get(Dictionary, word)
         if not result:
             return None
-        return {
-            "word": result.word,
-            "definition": result.definition,
-            "example": result.example,
-            "pronunciation": result.pronunciation,
-            "level": result.level,
-            "importance_rate": result.importance_rate,
-            "synonyms": result.synonyms,
-        }
+        data = _to_dict(result)
+        _definition_cache.set(word, data)
+        return dict(data)
 
 
-async def add_to_study_list(user_id: int, word_data: dict) -> bool:
+def get_definition_cache_stats() -> dict:
+    return _definition_cache.stats()
+
+
+async def get_all_words() -> list[str]:
     async with AsyncSessionLocal() as session:
-        import time
-        word = word_data['word'].lower().strip()
-
-        stmt = select(UserWord).where(UserWord.user_id == user_id, UserWord.word == word)
-        if (await session.execute(stmt)).scalar_one_or_none():
-            return False  # already studying
-
-        session.add(UserWord(
-            user_id=user_id,
-            word=word,
-            state="learning",
-            step=0,
-            next_review=int(time.time()),
-            interval=1,
-            ease_factor=2.5,
-        ))
-        await session.commit()
-        return True
+        return list((await session.execute(select(Dictionary.word))).scalars())
+
+
+async def load_fuzzy_index() -> int:
+    global _fuzzy_index
+    words = await get_all_words()
+
+    # Building takes a few seconds for big dictionaries; keep it off the loop
+    index = await asyncio.to_thread(FuzzyIndex, words)
+    for word in _fuzzy_index.words - index.words:
+        index.add(word)  # saved while we were building
+    _fuzzy_index = index
+    return len(index)
+
+
+def suggest_words(word: str, limit: int = 3) -> list[str]:
+    """Cached headwords within a small edit distance of a (misspelled) word."""
+    word = word.lower().strip()
+    max_distance = 1 if len(word) <= 5 else 2
+    return [w for _, w in _fuzzy_index.lookup(word, max_distance, limit)]
+
+
+async def add_to_study_list(user_id: int, word_data: dict) -> bool:
+    await ensure_user_saved(user_id)  # words.user_id references users
+
+    # The unique (user_id, word) index decides, so two quick taps can't both
+    # insert; only that clash is skipped, anything else (a bad FK) raises.
+    # MySQL reports the no-op duplicate as 1 row (CLIENT_FOUND_ROWS), hence
+    # the lookup for the "already studying" answer.
+    word = word_data['word'].lower().strip()
+    now = int(time.time())
+    stmt = insert_skip_duplicate(UserWord, "user_id", "word").values(
+        user_id=user_id,
+        word=word,
+        state="learning",
+        step=0,
+        next_review=now,
+        interval=1,
+        ease_factor=2.5,
+    )
+    async with session_scope() as session:
+        studying = await session.scalar(
+            select(UserWord.id).where(UserWord.user_id == user_id, UserWord.word == word)
+        )
+        if studying is not None:
+            return False
+        result = await session.execute(stmt)
+        if result.rowcount > 0:
+            await lower_next_due(session, user_id, now)
+    return True
 
 
 async def get_user_dictionary(user_id: int, page: int = 0, limit: int = 5):
-    async with AsyncSessionLocal() as session:
+    async with session_scope() as session:
         offset = page * limit
 
         stmt = (
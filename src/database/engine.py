@@ -1,3 +1,7 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from ..config import settings
@@ -10,6 +14,95 @@ class Base(DeclarativeBase):
     pass
 
 
+class _UnitOfWork:
+    def __init__(self):
+        self.session = AsyncSessionLocal()
+        self.task = asyncio.current_task()
+        self.open = True
+
+
+_unit_of_work: ContextVar[_UnitOfWork | None] = ContextVar("unit_of_work", default=None)
+_session_stats = {"units_of_work": 0, "reused": 0, "standalone": 0}
+
+
+@asynccontextmanager
+async def unit_of_work():
+    """One session for every database call made by this task, committed once at the end."""
+    uow = _UnitOfWork()
+    _session_stats["units_of_work"] += 1
+    token = _unit_of_work.set(uow)
+    try:
+        yield uow.session
+        await uow.session.commit()
+    finally:
+        uow.open = False
+        _unit_of_work.reset(token)
+        await uow.session.close()  # rolls back if the handler failed
+
+
+@asynccontextmanager
+async def session_scope():
+    """The current unit of work's session, or a fresh one that commits on exit.
+
+    Tasks spawned from a handler inherit its context but must not share its
+    session (it is not safe for concurrent use and may be closed before they
+    finish), so only the task that opened the unit of work reuses it.
+    """
+    uow = _unit_of_work.get()
+    if uow is not None and uow.open and uow.task is asyncio.current_task():
+        _session_stats["reused"] += 1
+        yield uow.session
+        await uow.session.flush()  # surface errors here, not at the final commit
+        return
+
+    _session_stats["standalone"] += 1
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.commit()
+
+
+async def release_session():
+    """Commit the unit of work so far and give its connection back to the pool.
+
+    Call before a slow await (LLM, TTS, HTTP) so the handler does not hold a
+    connection while it waits; the session reconnects lazily if used again.
+    ReleaseSessionMiddleware does this before every Bot API call.
+    """
+    uow = _unit_of_work.get()
+    if uow is not None and uow.open and uow.task is asyncio.current_task():
+        await uow.session.commit()
+
+
+def get_session_stats() -> dict:
+    return dict(_session_stats)
+
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def insert_ignore(model):
+    """INSERT that silently skips rows whose key already exists, for the active dialect."""
+    dialect = engine.dialect.name
+    if dialect == "mysql":
+        return mysql.insert(model).prefix_with("IGNORE")
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    return sqlite.insert(model).on_conflict_do_nothing()
+
+
+def insert_skip_duplicate(model, *key: str):
+    """INSERT that skips a row clashing on the unique ``key`` columns only.
+
+    Unlike insert_ignore, every other error (a foreign key, a NULL, a bad
+    value) still raises, MySQL included.
+    """
+    dialect = engine.dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(model)
+        pk = model.__table__.primary_key.columns[0]
+        return stmt.on_duplicate_key_update({pk.name: pk})   # id = id: a no-op update
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing(index_elements=list(key))
+    return sqlite.insert(model).on_conflict_do_nothing(index_elements=list(key))
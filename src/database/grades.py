@@ -0,0 +1,147 @@
+import asyncio
+import time
+from typing import AsyncIterator
+from sqlalchemy import insert, select, update
+from ..config import settings
+from ..utils import Histogram
+from .engine import AsyncSessionLocal
+from .models import UserWord, ReviewLog
+from .reminders import refresh_next_due
+
+SCHEDULE_FIELDS = ("state", "step", "interval", "next_review", "ease_factor", "stability", "difficulty")
+REVIEW_GRADES = {"again": 1, "good": 3, "easy": 4}   # stored in review_log.grade (Anki's numbering)
+
+# Graded cards whose new schedule is not in the database yet, newest state
+# per card; run_grade_flusher writes them with one bulk UPDATE
+_pending_grades: dict[int, dict] = {}    # word_id -> {"id", "user_id", *SCHEDULE_FIELDS}
+_pending_reviews: list[dict] = []        # review_log rows, appended in the same flush
+_flushing: dict[int, dict] = {}          # taken by a flush whose commit hasn't finished yet
+_flush_lock = asyncio.Lock()
+_flush_wanted = asyncio.Event()
+_flush_time = Histogram()
+_grade_stats = {"graded": 0, "flushes": 0, "flushed": 0, "logged": 0}
+
+
+def buffered_schedule(word_id: int) -> dict | None:
+    return _pending_grades.get(word_id) or _flushing.get(word_id)
+
+
+def buffered_cards(user_id: int) -> dict[int, dict]:
+    """This user's schedules that the database may not show yet, by word id."""
+    cards = {g["id"]: g for g in _flushing.values() if g["user_id"] == user_id}
+    cards.update((g["id"], g) for g in _pending_grades.values() if g["user_id"] == user_id)
+    return cards
+
+
+def buffer_grade(word_id: int, user_id: int, schedule: dict):
+    _pending_grades[word_id] = {"id": word_id, "user_id": user_id, **schedule}
+    _grade_stats["graded"] += 1
+    if len(_pending_grades) >= settings.GRADE_FLUSH_SIZE:
+        _flush_wanted.set()  # don't wait for the interval
+
+
+def log_review(word_id: int, grade: str, prev_interval: int, new_interval: int, ease: float):
+    _pending_reviews.append({
+        "user_word_id": word_id,
+        "ts": int(time.time()),
+        "grade": REVIEW_GRADES[grade],
+        "prev_interval": prev_interval,
+        "new_interval": new_interval,
+        "ease": ease,
+    })
+    if len(_pending_reviews) >= settings.GRADE_FLUSH_SIZE:
+        _flush_wanted.set()
+
+
+async def flush_grades(user_id: int | None = None) -> int:
+    """Write buffered grades (only this user's, if given) with one bulk UPDATE by id.
+
+    Pending review_log rows go out in the same transaction with one bulk INSERT.
+    """
+    async with _flush_lock:
+        batch = [g for g in _pending_grades.values() if user_id is None or g["user_id"] == user_id]
+        reviews = _pending_reviews[:]
+        if not batch and not reviews:
+            return 0
+        for grade in batch:
+            del _pending_grades[grade["id"]]
+            _flushing[grade["id"]] = grade   # readers still see it until the commit
+        del _pending_reviews[:len(reviews)]
+
+        started = time.monotonic()
+        committed = False
+        try:
+            async with AsyncSessionLocal() as session:
+                if batch:
+                    await session.execute(
+                        update(UserWord),
+                        [{"id": g["id"], **{f: g[f] for f in SCHEDULE_FIELDS}} for g in batch],
+                    )
+                    await refresh_next_due(session, {g["user_id"] for g in batch})
+                if reviews:
+                    await session.execute(insert(ReviewLog), reviews)
+                await session.commit()
+                committed = True
+        finally:
+            # Failed or cancelled (shutdown): put everything back for the next flush
+            if not committed:
+                for grade in batch:
+                    _pending_grades.setdefault(grade["id"], grade)  # a newer grade wins
+                _pending_reviews[:0] = reviews
+            for grade in batch:
+                del _flushing[grade["id"]]
+
+        _flush_time.observe(time.monotonic() - started)
+        _grade_stats["flushes"] += 1
+        _grade_stats["flushed"] += len(batch)
+        _grade_stats["logged"] += len(reviews)
+        return len(batch)
+
+
+async def iter_review_log(chunk_size: int = 5000, since: int = 0) -> AsyncIterator[list[tuple]]:
+    """The review log in id order, ``chunk_size`` rows per query (keyset paging).
+
+    Rows are ``(id, ts, user_word_id, user_id, word, grade, prev_interval, new_interval, ease)``;
+    user_id/word are None for cards removed since. ``since`` is a unix timestamp.
+    """
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            stmt = (
+                select(
+                    ReviewLog.id, ReviewLog.ts, ReviewLog.user_word_id, UserWord.user_id, UserWord.word, ReviewLog.grade,
+                    ReviewLog.prev_interval, ReviewLog.new_interval, ReviewLog.ease,
+                )
+                .outerjoin(UserWord, UserWord.id == ReviewLog.user_word_id)
+                .where(ReviewLog.id > last_id, ReviewLog.ts >= since)
+                .order_by(ReviewLog.id)
+                .limit(chunk_size)
+            )
+            rows = [tuple(row) for row in (await session.execute(stmt)).all()]
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+async def run_grade_flusher():
+    while True:
+        try:
+            await asyncio.wait_for(_flush_wanted.wait(), timeout=settings.GRADE_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _flush_wanted.clear()
+        try:
+            await flush_grades()
+        except Exception as e:
+            print(f"Grade flush error: {e}")
+
+
+def get_grade_buffer_stats() -> dict:
+    return {
+        **_grade_stats,
+        "pending": len(_pending_grades),
+        "pending_reviews": len(_pending_reviews),
+        "flush_p50": _flush_time.percentile(0.50),
+        "flush_p95": _flush_time.percentile(0.95),
+    }
@@ -0,0 +1,32 @@
+from sqlalchemy import select, delete, insert
+from .engine import AsyncSessionLocal
+from .models import Lemma
+
+# form → lemma, loaded once at startup so resolving is a dict lookup
+_lemma_index: dict[str, str] = {}
+
+
+async def load_lemma_index() -> int:
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(select(Lemma.form, Lemma.lemma))).all()
+
+    _lemma_index.clear()
+    _lemma_index.update(rows)
+    return len(_lemma_index)
+
+
+def resolve_lemma(word: str) -> str:
+    return _lemma_index.get(word, word)
+
+
+async def replace_lemma_index(index: dict[str, str], chunk_size: int = 5000):
+    rows = [{"form": form, "lemma": lemma} for form, lemma in index.items()]
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Lemma))
+        for i in range(0, len(rows), chunk_size):
+            await session.execute(insert(Lemma), rows[i:i + chunk_size])
+        await session.commit()
+
+    _lemma_index.clear()
+    _lemma_index.update(index)
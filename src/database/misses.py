@@ -0,0 +1,61 @@
+import time
+from sqlalchemy import select, delete
+from ..config import settings
+from ..utils import TTLCache
+from .engine import AsyncSessionLocal
+from .models import MissedWord
+
+# Words the LLM could not define; kept apart from the dictionary so a real
+# word that was missed once can still be added after its entry expires
+_negative_cache = TTLCache(settings.NEGATIVE_CACHE_SIZE, settings.NEGATIVE_CACHE_TTL)
+
+
+async def load_negative_cache() -> int:
+    now = int(time.time())
+    cutoff = now - settings.NEGATIVE_CACHE_TTL
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(MissedWord).where(MissedWord.created_at < cutoff))
+        rows = (await session.execute(
+            select(MissedWord.word, MissedWord.created_at)
+            .order_by(MissedWord.created_at.desc())
+            .limit(settings.NEGATIVE_CACHE_SIZE)
+        )).all()
+
+        # Keep the table as bounded as the in-memory tier
+        if len(rows) == settings.NEGATIVE_CACHE_SIZE:
+            await session.execute(delete(MissedWord).where(MissedWord.created_at < rows[-1].created_at))
+        await session.commit()
+
+    _negative_cache.clear()
+    for word, created_at in reversed(rows):  # oldest first, so LRU order matches age
+        _negative_cache.set(word, True, ttl=max(1, created_at + settings.NEGATIVE_CACHE_TTL - now))
+    return len(_negative_cache)
+
+
+def is_known_miss(word: str, count: bool = True) -> bool:
+    return _negative_cache.get(word, False, count=count)
+
+
+async def remember_miss(word: str):
+    _negative_cache.set(word, True)
+    async with AsyncSessionLocal() as session:
+        await session.merge(MissedWord(word=word, created_at=int(time.time())))
+        await session.commit()
+
+
+async def forget_miss(word: str):
+    await forget_misses([word])
+
+
+async def forget_misses(words: list[str]):
+    """The words have definitions now: drop any stale miss for them."""
+    for word in words:
+        _negative_cache.pop(word)
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(MissedWord).where(MissedWord.word.in_(words)))
+        await session.commit()
+
+
+def get_negative_cache_stats() -> dict:
+    return _negative_cache.stats()
@@ -1,13 +1,19 @@
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import BigInteger, Integer, String, ForeignKey, Float
+from sqlalchemy import BigInteger, Integer, SmallInteger, String, ForeignKey, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from .engine import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_active_next_due", "active", "next_due"),   # who has cards due
+    )
     user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     active: Mapped[bool] = mapped_column(default=True)
+    next_due: Mapped[int] = mapped_column(Integer, nullable=True)        # MIN(words.next_review)
+    last_reminded: Mapped[int] = mapped_column(Integer, nullable=True)
+    utc_offset: Mapped[int] = mapped_column(SmallInteger, nullable=True)  # minutes, for quiet hours
 
 class Dictionary(Base):
     __tablename__ = "dictionary"
@@ -22,6 +28,10 @@ class Dictionary(Base):
 
 class UserWord(Base):
     __tablename__ = "words"
+    __table_args__ = (
+        Index("ix_words_user_id_next_review", "user_id", "next_review"),   # due queue
+        Index("uq_words_user_id_word", "user_id", "word", unique=True),   # one row per word per user
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.user_id"))
     word: Mapped[str] = mapped_column(String(255), ForeignKey("dictionary.word"))
@@ -29,4 +39,48 @@ class UserWord(Base):
     step: Mapped[int] = mapped_column(Integer, default=0)
     next_review: Mapped[int] = mapped_column(Integer)
     interval: Mapped[int] = mapped_column(Integer, default=0)
-    ease_factor: Mapped[float] = mapped_column(Float, default=2.5)
\ No newline at end of file
+    ease_factor: Mapped[float] = mapped_column(Float, default=2.5)
+    stability: Mapped[float] = mapped_column(Float, nullable=True)     # FSRS memory state,
+    difficulty: Mapped[float] = mapped_column(Float, nullable=True)    # set on the first FSRS grade
+
+class Lemma(Base):
+    __tablename__ = "lemmas"
+    form: Mapped[str] = mapped_column(String(255), primary_key=True)
+    lemma: Mapped[str] = mapped_column(String(255))
+
+
+class MissedWord(Base):
+    __tablename__ = "missed_words"
+    word: Mapped[str] = mapped_column(String(255), primary_key=True)
+    created_at: Mapped[int] = mapped_column(Integer, index=True)
+
+
+class AudioFile(Base):
+    __tablename__ = "audio_files"
+    word: Mapped[str] = mapped_column(String(255), primary_key=True)
+    accent: Mapped[str] = mapped_column(String(8), primary_key=True)
+    source: Mapped[str] = mapped_column(String(16), primary_key=True)
+    file_id: Mapped[str] = mapped_column(String(255))
+    created_at: Mapped[int] = mapped_column(Integer)
+
+
+class ReviewLog(Base):
+    """One row per quiz answer, never updated; for retention analysis and scheduler tuning."""
+    __tablename__ = "review_log"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_word_id: Mapped[int] = mapped_column(Integer, index=True)
+    ts: Mapped[int] = mapped_column(Integer)
+    grade: Mapped[int] = mapped_column(SmallInteger)   # REVIEW_GRADES code
+    prev_interval: Mapped[int] = mapped_column(Integer)
+    new_interval: Mapped[int] = mapped_column(Integer)
+    ease: Mapped[float] = mapped_column(Float)
+
+
+class SchedulerParams(Base):
+    """Fitted FSRS weights; user_id 0 holds the fit over everyone's reviews."""
+    __tablename__ = "scheduler_params"
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    weights: Mapped[str] = mapped_column(String(1000))   # JSON list
+    reviews: Mapped[int] = mapped_column(Integer)
+    loss: Mapped[float] = mapped_column(Float)
+    fitted_at: Mapped[int] = mapped_column(Integer)
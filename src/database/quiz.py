@@ -1,65 +1,118 @@
 import time
-from sqlalchemy import select
-from .engine import AsyncSessionLocal
+from sqlalchemy import select, or_, and_
+from .engine import session_scope
+from .grades import REVIEW_GRADES, SCHEDULE_FIELDS, buffered_schedule, buffered_cards, buffer_grade, log_review
+from .scheduler import get_scheduler
 from .models import UserWord, Dictionary
 
+# Cards graded since the last flush have a stale next_review in the table,
+# so the due queries skip their rows and let the buffered schedule decide.
+
+
+def _overlay(session, user_word: UserWord, card: dict):
+    session.expunge(user_word)  # detached, so the overlay is never written back
+    for field in SCHEDULE_FIELDS:
+        setattr(user_word, field, card[field])
+
 
 async def get_due_words(user_id: int):
-    async with AsyncSessionLocal() as session:
-        now = int(time.time())
+    now = int(time.time())
+    buffered = buffered_cards(user_id)
+    async with session_scope() as session:
         stmt = (
             select(UserWord, Dictionary)
             .join(Dictionary, UserWord.word == Dictionary.word)
             .where(UserWord.user_id == user_id, UserWord.next_review <= now)
             .order_by(UserWord.next_review)
         )
-        return (await session.execute(stmt)).all()
+        if buffered:
+            stmt = stmt.where(UserWord.id.not_in(list(buffered)))
+        rows = list((await session.execute(stmt)).all())
+
+        due = [word_id for word_id, card in buffered.items() if card["next_review"] <= now]
+        if due:
+            stmt = (
+                select(UserWord, Dictionary)
+                .join(Dictionary, UserWord.word == Dictionary.word)
+                .where(UserWord.id.in_(due))
+            )
+            for row in (await session.execute(stmt)).all():
+                _overlay(session, row[0], buffered[row[0].id])
+                rows.append(row)
+    rows.sort(key=lambda row: row[0].next_review)
+    return rows
+
+
+async def get_due_cards(user_id: int, after: tuple[int, int] | None = None, limit: int = 20) -> list[tuple]:
+    """One keyset page of due cards, ordered by (next_review, id).
+
+    Rows are ``(id, next_review, word, level, pronunciation)``; pass the
+    ``(next_review, id)`` of the last row as ``after`` to get the next page.
+    """
+    now = int(time.time())
+    buffered = buffered_cards(user_id)
+    due = {
+        word_id: card["next_review"] for word_id, card in buffered.items()
+        if card["next_review"] <= now and (after is None or (card["next_review"], word_id) > tuple(after))
+    }
+    async with session_scope() as session:
+        stmt = (
+            select(UserWord.id, UserWord.next_review, Dictionary.word, Dictionary.level, Dictionary.pronunciation)
+            .join(Dictionary, UserWord.word == Dictionary.word)
+            .where(UserWord.user_id == user_id, UserWord.next_review <= now)
+            .order_by(UserWord.next_review, UserWord.id)
+            .limit(limit)
+        )
+        if after is not None:
+            next_review, word_id = after
+            stmt = stmt.where(or_(
+                UserWord.next_review > next_review,
+                and_(UserWord.next_review == next_review, UserWord.id > word_id),
+            ))
+        if buffered:
+            stmt = stmt.where(UserWord.id.not_in(list(buffered)))
+        rows = [tuple(row) for row in (await session.execute(stmt)).all()]
+
+        if due:
+            stmt = (
+                select(UserWord.id, Dictionary.word, Dictionary.level, Dictionary.pronunciation)
+                .join(Dictionary, UserWord.word == Dictionary.word)
+                .where(UserWord.id.in_(list(due)))
+            )
+            for word_id, word, level, pronunciation in (await session.execute(stmt)).all():
+                rows.append((word_id, due[word_id], word, level, pronunciation))
+    # Both lists are in (next_review, id) order past the cursor, so the
+    # first ``limit`` of the merge are exactly the next page
+    rows.sort(key=lambda row: (row[1], row[0]))
+    return rows[:limit]
 
 
 async def get_study_details(user_word_id: int):
-    async with AsyncSessionLocal() as session:
+    async with session_scope() as session:
         stmt = (
             select(UserWord, Dictionary)
             .join(Dictionary, UserWord.word == Dictionary.word)
             .where(UserWord.id == user_word_id)
         )
-        return (await session.execute(stmt)).first()
+        row = (await session.execute(stmt)).first()
+        card = buffered_schedule(user_word_id)
+        if row is not None and card is not None:
+            _overlay(session, row[0], card)
+        return row
 
 
 async def update_anki_progress(word_id: int, grade: str):
-    async with AsyncSessionLocal() as session:
-        word = await session.get(UserWord, word_id)
+    """Grade a card in memory; the new schedule reaches the database with the next flush."""
+    if grade not in REVIEW_GRADES:
+        raise ValueError(f"Unknown grade: {grade!r}")  # before anything is buffered
+    card = buffered_schedule(word_id)
+    if card is None:
+        async with session_scope() as session:
+            word = await session.get(UserWord, word_id)
         if not word:
             return
+        card = {"user_id": word.user_id, **{f: getattr(word, f) for f in SCHEDULE_FIELDS}}
 
-        now = int(time.time())
-
-        if grade == "again":
-            word.state = "learning"
-            word.step = 0
-            word.interval = 0
-            word.next_review = now
-            word.ease_factor = max(1.3, word.ease_factor - 0.2)
-
-        elif grade == "good":
-            if word.state == "learning":
-                if word.step == 0:
-                    word.step = 1
-                    word.next_review = now + 600        # 10 min
-                else:
-                    word.state = "review"
-                    word.step = 0
-                    word.interval = 1
-                    word.next_review = now + 86400      # 1 day
-            else:
-                word.interval = max(1, int(word.interval * word.ease_factor))
-                word.next_review = now + (word.interval * 86400)
-
-        elif grade == "easy":
-            word.state = "review"
-            word.step = 0
-            word.interval = max(4, int(word.interval * word.ease_factor * 1.3))
-            word.next_review = now + (word.interval * 86400)
-            word.ease_factor = min(3.0, word.ease_factor + 0.1)
-
-        await session.commit()
\ No newline at end of file
+    new = get_scheduler(card["user_id"]).schedule(card, grade, int(time.time()))
+    buffer_grade(word_id, card["user_id"], new)
+    log_review(word_id, grade, card["interval"], new["interval"], new["ease_factor"])
@@ -0,0 +1,101 @@
+from typing import AsyncIterator
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from .engine import AsyncSessionLocal
+from .models import User, UserWord
+from .users import ensure_user_saved
+
+# users.next_due mirrors MIN(words.next_review) per user, so finding who has
+# something to review is a range scan on (active, next_due) instead of a scan
+# of words. Everything that moves a card's next_review keeps it in step.
+
+
+async def refresh_next_due(session: AsyncSession, user_ids):
+    """Recompute next_due for these users (one index seek per user) in the caller's transaction."""
+    if not user_ids:
+        return
+    earliest = (
+        select(func.min(UserWord.next_review))
+        .where(UserWord.user_id == User.user_id)
+        .scalar_subquery()
+    )
+    await session.execute(
+        update(User).where(User.user_id.in_(list(user_ids))).values(next_due=earliest)
+    )
+
+
+async def lower_next_due(session: AsyncSession, user_id: int, due: int):
+    """A card became due at ``due``: move next_due earlier if needed, no subquery."""
+    await session.execute(
+        update(User)
+        .where(User.user_id == user_id, (User.next_due == None) | (User.next_due > due))
+        .values(next_due=due)
+    )
+
+
+def _reminded_before(at: int):
+    return (User.last_reminded == None) | (User.last_reminded <= at)
+
+
+async def iter_due_users(
+    until: int, after: int | None = None, reminded_before: int | None = None, page_size: int = 1000,
+) -> AsyncIterator[list[tuple]]:
+    """Active users whose next_due is in ``(after, until]`` (no lower bound if ``after`` is None).
+
+    With ``reminded_before``, only users not reminded since then. Pages of
+    ``(user_id, next_due, last_reminded, utc_offset)`` in next_due order.
+    """
+    cursor = None    # (next_due, user_id) of the last row returned
+    while True:
+        async with AsyncSessionLocal() as session:
+            stmt = (
+                select(User.user_id, User.next_due, User.last_reminded, User.utc_offset)
+                .where(User.active == True, User.next_due <= until)
+                .order_by(User.next_due, User.user_id)
+                .limit(page_size)
+            )
+            if after is not None:
+                stmt = stmt.where(User.next_due > after)
+            if reminded_before is not None:
+                stmt = stmt.where(_reminded_before(reminded_before))
+            if cursor is not None:
+                stmt = stmt.where(
+                    (User.next_due > cursor[0]) | ((User.next_due == cursor[0]) & (User.user_id > cursor[1]))
+                )
+            rows = [tuple(row) for row in (await session.execute(stmt)).all()]
+        if not rows:
+            return
+        yield rows
+        cursor = (rows[-1][1], rows[-1][0])
+
+
+async def get_due_users(user_ids: list[int], now: int, reminded_before: int) -> list[tuple]:
+    """The same rows for specific users, if they are still due (re-checking deferred reminders)."""
+    async with AsyncSessionLocal() as session:
+        stmt = select(User.user_id, User.next_due, User.last_reminded, User.utc_offset).where(
+            User.user_id.in_(user_ids),
+            User.active == True,
+            User.next_due <= now,
+            _reminded_before(reminded_before),
+        )
+        return [tuple(row) for row in (await session.execute(stmt)).all()]
+
+
+async def count_due_cards(user_id: int, now: int) -> int:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(
+            select(func.count()).select_from(UserWord).where(UserWord.user_id == user_id, UserWord.next_review <= now)
+        )
+
+
+async def mark_reminded(user_ids: list[int], now: int):
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(User).where(User.user_id.in_(user_ids)).values(last_reminded=now))
+        await session.commit()
+
+
+async def set_utc_offset(user_id: int, minutes: int):
+    await ensure_user_saved(user_id)
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(User).where(User.user_id == user_id).values(utc_offset=minutes))
+        await session.commit()
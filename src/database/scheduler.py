@@ -0,0 +1,187 @@
+import json
+import math
+import time
+from abc import ABC, abstractmethod
+from sqlalchemy import select
+from ..config import settings
+from .engine import AsyncSessionLocal
+from .grades import REVIEW_GRADES
+from .models import SchedulerParams
+
+# ─── CONFIG ──────────────────────────────────────────────
+DAY = 86400
+LEARNING_STEP = 600          # seconds between learning steps, both schedulers
+MAX_INTERVAL = 36500         # days
+
+# FSRS-4.5 default weights, used until fit_scheduler has fitted some
+FSRS_DEFAULT_WEIGHTS = (
+    0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+    0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+)
+FSRS_DECAY = -0.5
+FSRS_FACTOR = 0.9 ** (1 / FSRS_DECAY) - 1    # 19/81, so retrievability is 0.9 after S days
+GLOBAL_PARAMS = 0                            # SchedulerParams.user_id of the all-users fit
+# ─────────────────────────────────────────────────────────
+
+
+class Scheduler(ABC):
+    """Turns a card's schedule plus a grade into its next schedule.
+
+    ``card`` holds SCHEDULE_FIELDS; ``schedule`` returns a new dict and never
+    mutates it, so callers can keep the old state (e.g. for the review log).
+    """
+
+    name = ""
+
+    @abstractmethod
+    def schedule(self, card: dict, grade: str, now: int) -> dict:
+        ...
+
+
+class SM2Scheduler(Scheduler):
+    """The original fixed-constant SM-2 variant: ease factors and two 10-minute learning steps."""
+
+    name = "sm2"
+
+    def schedule(self, card: dict, grade: str, now: int) -> dict:
+        card = dict(card)
+
+        if grade == "again":
+            card["state"] = "learning"
+            card["step"] = 0
+            card["interval"] = 0
+            card["next_review"] = now
+            card["ease_factor"] = max(1.3, card["ease_factor"] - 0.2)
+
+        elif grade == "good":
+            if card["state"] == "learning":
+                if card["step"] == 0:
+                    card["step"] = 1
+                    card["next_review"] = now + LEARNING_STEP
+                else:
+                    card["state"] = "review"
+                    card["step"] = 0
+                    card["interval"] = 1
+                    card["next_review"] = now + DAY
+            else:
+                card["interval"] = max(1, int(card["interval"] * card["ease_factor"]))
+                card["next_review"] = now + (card["interval"] * DAY)
+
+        elif grade == "easy":
+            card["state"] = "review"
+            card["step"] = 0
+            card["interval"] = max(4, int(card["interval"] * card["ease_factor"] * 1.3))
+            card["next_review"] = now + (card["interval"] * DAY)
+            card["ease_factor"] = min(3.0, card["ease_factor"] + 0.1)
+
+        return card
+
+
+class FSRSScheduler(Scheduler):
+    """FSRS-4.5 memory model: per-card stability (days) and difficulty (1-10).
+
+    Reviews less than a day after the previous one are learning steps and
+    leave the memory state alone, the same rule fit_scheduler replays the
+    history with. Cards graded under SM-2 are seeded from their interval
+    and ease the first time.
+    """
+
+    name = "fsrs"
+
+    def __init__(self, weights=FSRS_DEFAULT_WEIGHTS, retention: float | None = None):
+        self.w = tuple(weights)
+        self.retention = retention or settings.FSRS_RETENTION
+
+    def init_stability(self, g: int) -> float:
+        return self.w[g - 1]
+
+    def init_difficulty(self, g: int) -> float:
+        return min(10.0, max(1.0, self.w[4] - (g - 3) * self.w[5]))
+
+    @staticmethod
+    def retrievability(elapsed: float, s: float) -> float:
+        return (1 + FSRS_FACTOR * elapsed / s) ** FSRS_DECAY
+
+    def next_difficulty(self, d: float, g: int) -> float:
+        d = self.w[7] * self.init_difficulty(4) + (1 - self.w[7]) * (d - self.w[6] * (g - 3))
+        return min(10.0, max(1.0, d))
+
+    def next_stability(self, d: float, s: float, r: float, g: int) -> float:
+        w = self.w
+        if g == 1:
+            forgot = w[11] * d ** -w[12] * ((s + 1) ** w[13] - 1) * math.exp(w[14] * (1 - r))
+            return min(s, forgot)
+        bonus = w[15] if g == 2 else w[16] if g == 4 else 1.0
+        return s * (1 + math.exp(w[8]) * (11 - d) * s ** -w[9] * (math.exp(w[10] * (1 - r)) - 1) * bonus)
+
+    def interval(self, s: float) -> int:
+        days = s / FSRS_FACTOR * (self.retention ** (1 / FSRS_DECAY) - 1)
+        return min(MAX_INTERVAL, max(1, round(days)))
+
+    def schedule(self, card: dict, grade: str, now: int) -> dict:
+        card = dict(card)
+        g = REVIEW_GRADES[grade]
+        s, d = card.get("stability"), card.get("difficulty")
+
+        if card["state"] == "review":
+            last_review = card["next_review"] - card["interval"] * DAY
+        else:
+            last_review = card["next_review"] - LEARNING_STEP
+        elapsed = max(0.0, (now - last_review) / DAY)
+
+        if s is None and card["state"] == "review" and card["interval"]:
+            # Graduated under SM-2: its interval is the best stability guess we have
+            s = float(card["interval"])
+            d = min(10.0, max(1.0, self.init_difficulty(3) + (2.5 - card["ease_factor"]) * 5))
+        if s is None:
+            s, d = self.init_stability(g), self.init_difficulty(g)
+        elif elapsed >= 1:
+            r = self.retrievability(elapsed, s)
+            s, d = self.next_stability(d, s, r, g), self.next_difficulty(d, g)
+        card["stability"], card["difficulty"] = s, d
+
+        if g == 1:
+            card.update(state="learning", step=0, interval=0, next_review=now + LEARNING_STEP)
+        elif card["state"] != "review" and g == 3 and card["step"] == 0:
+            card.update(state="learning", step=1, next_review=now + LEARNING_STEP)
+        else:
+            interval = self.interval(s)
+            card.update(state="review", step=0, interval=interval, next_review=now + interval * DAY)
+        return card
+
+
+_sm2 = SM2Scheduler()
+_fsrs: dict[int, FSRSScheduler] = {}     # user_id (GLOBAL_PARAMS = everyone) -> fitted scheduler
+
+
+def get_scheduler(user_id: int) -> Scheduler:
+    if settings.SCHEDULER != "fsrs":
+        return _sm2
+    scheduler = _fsrs.get(user_id) or _fsrs.get(GLOBAL_PARAMS)
+    if scheduler is None:
+        scheduler = _fsrs[GLOBAL_PARAMS] = FSRSScheduler()
+    return scheduler
+
+
+async def load_scheduler_params() -> int:
+    """Load fitted FSRS weights; returns how many parameter sets (global + per user)."""
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(select(SchedulerParams))).scalars().all()
+    _fsrs.clear()
+    for row in rows:
+        _fsrs[row.user_id] = FSRSScheduler(json.loads(row.weights))
+    return len(rows)
+
+
+async def save_scheduler_params(fits: dict[int, tuple[list[float], int, float]]):
+    """Store fitted weights: ``{user_id: (weights, reviews, loss)}``, GLOBAL_PARAMS for everyone."""
+    async with AsyncSessionLocal() as session:
+        for user_id, (weights, reviews, loss) in fits.items():
+            await session.merge(SchedulerParams(
+                user_id=user_id,
+                weights=json.dumps([round(float(w), 6) for w in weights]),
+                reviews=reviews,
+                loss=loss,
+                fitted_at=int(time.time()),
+            ))
+        await session.commit()
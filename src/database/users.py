@@ -1,12 +1,89 @@
-from .engine import AsyncSessionLocal
+import asyncio
+import time
+from sqlalchemy import select
+from ..config import settings
+from .engine import AsyncSessionLocal, insert_ignore
 from .models import User
 
+# Every user id in the table, so add_user answers from memory; new ids are
+# queued and written in batches by run_user_flusher
+_known_users: set[int] = set()
+_pending_users: set[int] = set()
+_flush_lock = asyncio.Lock()
+_last_active: dict[int, int] = {}   # user_id -> unix time of their latest update
+_user_stats = {"flushes": 0, "flushed": 0}
 
-async def add_user(user_id: int) -> bool:
+
+async def load_known_users() -> int:
     async with AsyncSessionLocal() as session:
-        user = await session.get(User, user_id)
-        if not user:
-            session.add(User(user_id=user_id))
+        user_ids = (await session.execute(select(User.user_id))).scalars().all()
+    _known_users.clear()
+    _known_users.update(user_ids)
+    return len(_known_users)
+
+
+async def add_user(user_id: int) -> bool:
+    if user_id in _known_users:
+        return False      # existing user
+    _known_users.add(user_id)
+    _pending_users.add(user_id)
+    return True           # new user
+
+
+def touch_user(user_id: int):
+    _last_active[user_id] = int(time.time())
+
+
+def last_active(user_id: int) -> int:
+    return _last_active.get(user_id, 0)
+
+
+def prune_last_active(before: int) -> int:
+    """Forget users idle since ``before``; returns how many were dropped."""
+    idle = [user_id for user_id, at in _last_active.items() if at < before]
+    for user_id in idle:
+        del _last_active[user_id]
+    return len(idle)
+
+
+async def flush_new_users() -> int:
+    """Write queued users with one INSERT IGNORE; rows that already exist are skipped."""
+    async with _flush_lock:
+        if not _pending_users:
+            return 0
+        batch = list(_pending_users)
+
+        # Ids stay pending until the commit, so ensure_user_saved keeps
+        # waiting for a flush that is still in flight (or failed)
+        async with AsyncSessionLocal() as session:
+            await session.execute(insert_ignore(User), [{"user_id": uid} for uid in batch])
             await session.commit()
-            return True   # new user
-        return False      # existing user
\ No newline at end of file
+        _pending_users.difference_update(batch)
+
+        _user_stats["flushes"] += 1
+        _user_stats["flushed"] += len(batch)
+        return len(batch)
+
+
+async def ensure_user_saved(user_id: int):
+    """Flush now if this user is still queued (rows referencing users need it)."""
+    if user_id in _pending_users:
+        await flush_new_users()
+
+
+async def run_user_flusher():
+    while True:
+        await asyncio.sleep(settings.USER_FLUSH_INTERVAL)
+        try:
+            await flush_new_users()
+        except Exception as e:
+            print(f"User flush error: {e}")
+
+
+def get_user_registry_stats() -> dict:
+    return {
+        "known": len(_known_users),
+        "pending": len(_pending_users),
+        "active": len(_last_active),
+        **_user_stats,
+    }
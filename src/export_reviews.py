@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import csv
+import gzip
+import sys
+import time
+
+from .database import iter_review_log, REVIEW_GRADES
+from .database.engine import engine
+
+# Usage: python -m src.export_reviews reviews.csv.gz [--since 2026-01-01] [--chunk 5000]
+# Streams the review log to CSV (gzipped when the name ends in .gz, stdout for "-")
+# one chunk at a time, so memory stays flat however long the log is.
+
+# ─── CONFIG ──────────────────────────────────────────────
+COLUMNS = ("id", "ts", "user_word_id", "user_id", "word", "grade", "prev_interval", "new_interval", "ease")
+GRADE_NAMES = {code: name for name, code in REVIEW_GRADES.items()}
+# ─────────────────────────────────────────────────────────
+
+
+def _open(path: str):
+    if path == "-":
+        return sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+async def main(path: str, since: int, chunk: int):
+    started = time.perf_counter()
+    total = 0
+
+    out = _open(path)
+    try:
+        writer = csv.writer(out)
+        writer.writerow(COLUMNS)
+        async for rows in iter_review_log(chunk, since):
+            writer.writerows(
+                (*row[:5], GRADE_NAMES.get(row[5], row[5]), *row[6:]) for row in rows
+            )
+            total += len(rows)
+            print(f"⏳ {total} rows", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"🎉 Exported {total} reviews in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    await engine.dispose()
+
+
+def _timestamp(value: str) -> int:
+    if value.isdigit():
+        return int(value)
+    return int(time.mktime(time.strptime(value, "%Y-%m-%d")))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the quiz review log as CSV")
+    parser.add_argument("path", help="output file (.csv or .csv.gz), or - for stdout")
+    parser.add_argument("--since", type=_timestamp, default=0, help="YYYY-MM-DD or unix timestamp")
+    parser.add_argument("--chunk", type=int, default=5000, help="rows per query")
+    args = parser.parse_args()
+    asyncio.run(main(args.path, args.since, args.chunk))
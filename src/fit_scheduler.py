@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install "lexigo[fit]"
+    np = None
+
+from sqlalchemy import select, update
+
+from .config import settings
+from .database import FSRSScheduler, iter_review_log, save_scheduler_params
+from .database.engine import AsyncSessionLocal, engine
+from .database.reminders import refresh_next_due
+from .database.models import UserWord
+from .database.scheduler import DAY, FSRS_DECAY, FSRS_DEFAULT_WEIGHTS, FSRS_FACTOR, GLOBAL_PARAMS
+
+# Usage: python -m src.fit_scheduler [--per-user] [--min-reviews 400] [--reschedule]
+# Fits FSRS weights to the review log by replaying every card's history with
+# NumPy: cards are the vector axis, reviews are the loop. --per-user also fits
+# users with enough reviews on their own (starting from the global fit), and
+# --reschedule writes each card's replayed memory state and next review date
+# back to the words table in chunks (needs SCHEDULER=fsrs).
+
+# ─── CONFIG ──────────────────────────────────────────────
+ITERATIONS = 150
+LEARNING_RATE = 0.02         # Adam step, relative to each weight's size
+STEP_FLOOR = 0.1             # ...but never smaller than this
+RESCHEDULE_CHUNK = 1000      # cards per UPDATE
+# Allowed range per weight, as in the FSRS optimizer
+BOUNDS = (
+    (0.01, 100), (0.01, 100), (0.01, 100), (0.01, 100), (1, 10), (0.01, 4), (0.01, 4), (0, 0.75),
+    (0, 4.5), (0, 0.8), (0.01, 3.5), (0.01, 5), (0.01, 0.25), (0.01, 0.9), (0.01, 4), (0, 1), (1, 6),
+)
+# ─────────────────────────────────────────────────────────
+
+
+def _pack(histories: dict[int, list[tuple[int, int]]]):
+    """Pad histories into ``[cards, reviews]`` grade and time (days) matrices.
+
+    Cards are sorted longest first, so the cards that have an i-th review are
+    always a prefix: ``active[i]`` of them.
+    """
+    ids = sorted(histories, key=lambda card_id: -len(histories[card_id]))
+    width = len(histories[ids[0]])
+    grades = np.zeros((len(ids), width), dtype=np.int8)
+    days = np.zeros((len(ids), width))
+    for row, card_id in enumerate(ids):
+        history = histories[card_id]
+        grades[row, :len(history)] = [g for _, g in history]
+        days[row, :len(history)] = [ts / DAY for ts, _ in history]
+    active = (grades > 0).sum(axis=0)
+    return ids, grades, days, active
+
+
+def _replay(weights, grades, days, active):
+    """Run FSRSScheduler's memory model over every history, for several weight sets at once.
+
+    ``weights`` is ``[sets, 17]``. Returns the mean log loss of the predicted
+    recall on every review at least a day after the previous one (per set),
+    and the final stability and difficulty, ``[sets, cards]`` each.
+    """
+    w = weights.T[:, :, None]   # w[i] broadcasts against [sets, cards]
+    first = grades[:, 0]
+    s = weights[:, first - 1]
+    d = np.clip(w[4] - (first - 3) * w[5], 1, 10)
+    easy_difficulty = np.clip(w[4] - w[5], 1, 10)
+
+    loss = np.zeros(len(weights))
+    scored = 0
+    for i in range(1, grades.shape[1]):
+        n = active[i]
+        elapsed = days[:n, i] - days[:n, i - 1]
+        idx = np.nonzero(elapsed >= 1)[0]   # same-day reviews are learning steps
+        if not len(idx):
+            continue
+        g, t = grades[idx, i], elapsed[idx]
+        ss, dd = s[:, idx], d[:, idx]
+
+        r = (1 + FSRS_FACTOR * t / ss) ** FSRS_DECAY
+        recalled = g > 1
+        p = np.clip(r, 1e-6, 1 - 1e-6)
+        loss -= np.where(recalled, np.log(p), np.log(1 - p)).sum(axis=1)
+        scored += len(idx)
+
+        bonus = np.where(g == 2, w[15], 1) * np.where(g == 4, w[16], 1)
+        recall = ss * (1 + np.exp(w[8]) * (11 - dd) * ss ** -w[9] * (np.exp(w[10] * (1 - r)) - 1) * bonus)
+        forget = np.minimum(ss, w[11] * dd ** -w[12] * ((ss + 1) ** w[13] - 1) * np.exp(w[14] * (1 - r)))
+        s[:, idx] = np.where(recalled, recall, forget)
+        d[:, idx] = np.clip(w[7] * easy_difficulty + (1 - w[7]) * (dd - w[6] * (g - 3)), 1, 10)
+
+    return loss / max(scored, 1), s, d
+
+
+def fit(grades, days, active, start=FSRS_DEFAULT_WEIGHTS, iterations=ITERATIONS) -> tuple["np.ndarray", float]:
+    """Adam on central finite differences; all 35 weight sets go through one replay."""
+    lo, hi = np.array(BOUNDS, dtype=float).T
+    w = np.clip(np.array(start, dtype=float), lo, hi)
+    m = np.zeros_like(w)
+    v = np.zeros_like(w)
+    eye = np.eye(len(w))
+
+    for step in range(1, iterations + 1):
+        eps = 1e-3 * np.maximum(np.abs(w), 0.01)
+        plus = np.clip(w + eye * eps, lo, hi)
+        minus = np.clip(w - eye * eps, lo, hi)
+        loss, _, _ = _replay(np.vstack([plus, minus]), grades, days, active)
+
+        width = plus.diagonal() - minus.diagonal()
+        grad = np.divide(loss[:len(w)] - loss[len(w):], width, out=np.zeros_like(w), where=width > 0)
+        m = 0.9 * m + 0.1 * grad
+        v = 0.999 * v + 0.001 * grad ** 2
+        m_hat, v_hat = m / (1 - 0.9 ** step), v / (1 - 0.999 ** step)
+        w = np.clip(w - LEARNING_RATE * np.maximum(np.abs(w), STEP_FLOOR) * m_hat / (np.sqrt(v_hat) + 1e-8), lo, hi)
+
+    loss, _, _ = _replay(w[None, :], grades, days, active)
+    return w, float(loss[0])
+
+
+async def _load_histories():
+    histories: dict[int, list[tuple[int, int]]] = defaultdict(list)
+    owners: dict[int, int] = {}
+    reviews = 0
+    async for rows in iter_review_log():
+        for _, ts, user_word_id, user_id, _, grade, _, _, _ in rows:
+            histories[user_word_id].append((ts, grade))
+            if user_id is not None:
+                owners[user_word_id] = user_id
+        reviews += len(rows)
+    return histories, owners, reviews
+
+
+async def _reschedule(cards: dict[int, tuple[float, float, int]], schedulers: dict[int, FSRSScheduler], owners):
+    """Write replayed (stability, difficulty) and the FSRS due date, RESCHEDULE_CHUNK cards per UPDATE."""
+    ids = sorted(card_id for card_id in cards if card_id in owners)
+    moved = 0
+    for i in range(0, len(ids), RESCHEDULE_CHUNK):
+        chunk = ids[i:i + RESCHEDULE_CHUNK]
+        async with AsyncSessionLocal() as session:
+            states = dict((await session.execute(
+                select(UserWord.id, UserWord.state).where(UserWord.id.in_(chunk))
+            )).all())
+            rows = []
+            for card_id, state in states.items():
+                s, d, last_review = cards[card_id]
+                row = {"id": card_id, "stability": s, "difficulty": d}
+                if state == "review":
+                    scheduler = schedulers.get(owners[card_id]) or schedulers[GLOBAL_PARAMS]
+                    interval = scheduler.interval(s)
+                    row.update(interval=interval, next_review=last_review + interval * DAY)
+                    moved += 1
+                rows.append(row)
+            if rows:
+                await session.execute(update(UserWord), rows)
+                await refresh_next_due(session, {owners[card_id] for card_id in states})
+                await session.commit()
+        print(f"⏳ {min(i + RESCHEDULE_CHUNK, len(ids))}/{len(ids)} cards rescheduled")
+    return moved
+
+
+async def main(per_user: bool, min_reviews: int, reschedule: bool):
+    started = time.perf_counter()
+    histories, owners, reviews = await _load_histories()
+    if not histories:
+        print("🤷 The review log is empty, nothing to fit")
+        return await engine.dispose()
+    print(f"📦 {reviews} reviews of {len(histories)} cards loaded in {time.perf_counter() - started:.1f}s")
+
+    t = time.perf_counter()
+    ids, grades, days, active = _pack(histories)
+    weights, loss = fit(grades, days, active)
+    fits = {GLOBAL_PARAMS: (weights, reviews, loss)}
+    print(f"🧮 Global fit: log loss {loss:.4f} in {time.perf_counter() - t:.1f}s")
+
+    by_user: dict[int, dict] = defaultdict(dict)
+    for card_id, history in histories.items():
+        if card_id in owners:
+            by_user[owners[card_id]][card_id] = history
+    if per_user:
+        for user_id, user_cards in by_user.items():
+            count = sum(len(h) for h in user_cards.values())
+            if count < min_reviews:
+                continue
+            _, g, dd, a = _pack(user_cards)
+            user_weights, user_loss = fit(g, dd, a, start=weights, iterations=ITERATIONS // 2)
+            fits[user_id] = (user_weights, count, user_loss)
+        print(f"👤 Per-user fits: {len(fits) - 1} users with ≥{min_reviews} reviews")
+
+    await save_scheduler_params(fits)
+
+    if reschedule:
+        schedulers = {user_id: FSRSScheduler(w) for user_id, (w, _, _) in fits.items()}
+        cards: dict[int, tuple[float, float, int]] = {}
+        groups = [(GLOBAL_PARAMS, {c: h for u, uc in by_user.items() if u not in fits for c, h in uc.items()})]
+        groups += [(user_id, by_user[user_id]) for user_id in fits if user_id != GLOBAL_PARAMS]
+        for params, group in groups:
+            if not group:
+                continue
+            group_ids, g, dd, a = _pack(group)
+            _, s, d = _replay(np.array(fits[params][0])[None, :], g, dd, a)
+            for row, card_id in enumerate(group_ids):
+                cards[card_id] = (float(s[0, row]), float(d[0, row]), group[card_id][-1][0])
+        moved = await _reschedule(cards, schedulers, owners)
+        print(f"📅 {moved} review cards got a new due date")
+
+    print(f"🎉 Done in {time.perf_counter() - started:.1f}s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit FSRS scheduler weights to the review log")
+    parser.add_argument("--per-user", action="store_true", help="also fit users with enough reviews")
+    parser.add_argument("--min-reviews", type=int, default=400, help="reviews a user needs for their own fit")
+    parser.add_argument("--reschedule", action="store_true", help="rewrite due dates with the new weights")
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit('NumPy is needed for fitting: pip install "lexigo[fit]"')
+    if args.reschedule and settings.SCHEDULER != "fsrs":
+        sys.exit("--reschedule only makes sense with SCHEDULER=fsrs")
+    asyncio.run(main(args.per_user, args.min_reviews, args.reschedule))
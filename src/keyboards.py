@@ -45,6 +45,19 @@ def add_word_kb(word: str) -> InlineKeyboardMarkup:
     kb.adjust(2)
     return kb.as_markup()
 
+def _fits_callback(data: str) -> bool:
+    return len(data.encode()) <= 64  # Telegram callback_data limit, in bytes
+
+def did_you_mean_kb(suggestions: list[str], word: str) -> InlineKeyboardMarkup:
+    kb = InlineKeyboardBuilder()
+    for suggestion in suggestions:
+        if _fits_callback(f"lookup:{suggestion}"):
+            kb.button(text=f"✅ {suggestion}", callback_data=f"lookup:{suggestion}")
+    if _fits_callback(f"lookup:{word}"):
+        kb.button(text=f"🔍 Search \"{word}\" anyway", callback_data=f"lookup:{word}")
+    kb.adjust(1)
+    return kb.as_markup()
+
 def quiz_show_kb(word_id: int) -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
     kb.button(text="👀 Show Definition", callback_data=f"show:{word_id}")
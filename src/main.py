@@ -2,19 +2,61 @@ import asyncio
 import logging
 import sys
 from .core import bot, dp
-from .database import init_db
+from .core.bot import run_subscription_refresher
+from .core.middleware import UnitOfWorkMiddleware, ActivityMiddleware, ReleaseSessionMiddleware
+from .database import (
+    init_db,
+    load_known_users,
+    load_lemma_index,
+    load_fuzzy_index,
+    load_negative_cache,
+    load_scheduler_params,
+    flush_new_users,
+    run_user_flusher,
+    flush_grades,
+    run_grade_flusher,
+)
+from .services import load_audio_store, start_http, close_http, cancel_prefetches, run_reminders
 from .routes import register_all_routers
+from .config import settings
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
 async def main():
     await init_db()
+    print(f"👥 Known users: {await load_known_users()}")
+    print(f"📚 Lemma index: {await load_lemma_index()} forms")
+    print(f"🔤 Spelling index: {await load_fuzzy_index()} words")
+    print(f"🚫 Negative cache: {await load_negative_cache()} words")
+    print(f"🎧 Audio store: {await load_audio_store()} files")
+    print(f"🧮 Scheduler: {settings.SCHEDULER}, {await load_scheduler_params()} fitted parameter sets")
+    dp.update.outer_middleware(ActivityMiddleware())
+    dp.update.outer_middleware(UnitOfWorkMiddleware())
+    bot.session.middleware(ReleaseSessionMiddleware())
     register_all_routers(dp)
+    await start_http()
+    background = [
+        asyncio.create_task(run_user_flusher()),
+        asyncio.create_task(run_grade_flusher()),
+    ]
+    if settings.SUBSCRIPTION_REFRESH_INTERVAL:
+        background.append(asyncio.create_task(run_subscription_refresher()))
+    if settings.REMINDER_INTERVAL:
+        background.append(asyncio.create_task(run_reminders()))
     print("🚀 Bot is running on Polling mode...")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)  # let them put back what they held
+        cancel_prefetches()
+        await flush_new_users()  # don't lose users who joined in the last interval
+        await flush_grades()     # ...or quiz answers given in it
+        await close_http()
 
 if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        print("🛑 Bot stopped!")
\ No newline at end of file
+        print("🛑 Bot stopped!")
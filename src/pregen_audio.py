@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import time
+
+from .database import init_db, get_all_words
+from .database.engine import engine
+from .services import generate_tts_batch, has_tts, load_audio_store, get_audio_store_stats
+
+# Usage: python -m src.pregen_audio [--concurrency 4] [--limit 5000] [--tld us]
+# Generates TTS audio for every dictionary word that is not in the local
+# audio store yet, so pronunciation taps are served straight from disk.
+# Safe to interrupt: rerunning skips words already stored.
+
+# ─── CONFIG ──────────────────────────────────────────────
+PROGRESS_EVERY = 100
+# ─────────────────────────────────────────────────────────
+
+
+async def main(concurrency: int, limit: int | None, lang: str, tld: str):
+    await init_db()
+    print(f"🎧 Audio store: {await load_audio_store()} files")
+
+    words = await get_all_words()
+    missing = [w for w in words if not has_tts(w, lang, tld)][:limit]
+    print(f"📦 {len(words)} words in dictionary, {len(missing)} without audio")
+
+    started = time.perf_counter()
+    failed = 0
+
+    for i in range(0, len(missing), PROGRESS_EVERY):
+        chunk = missing[i:i + PROGRESS_EVERY]
+        results = await generate_tts_batch(chunk, lang, tld, concurrency=concurrency)
+        failed += sum(path is None for path in results.values())
+
+        done = i + len(chunk)
+        rate = done / (time.perf_counter() - started)
+        print(f"⏳ {done}/{len(missing)} — {failed} failed, {rate:.1f} words/s")
+
+    stats = get_audio_store_stats()
+    print(f"🎉 Done! {stats['files']} files, {stats['bytes'] / 2**20:.1f} MB, {stats['evictions']} evicted")
+    print(f"⏱ Queue wait p95 {stats['queue_wait']['p95']:.2f}s, synthesis p50/p95 "
+          f"{stats['synthesis']['p50']:.2f}s / {stats['synthesis']['p95']:.2f}s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate TTS audio for the dictionary")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel gTTS requests")
+    parser.add_argument("--limit", type=int, default=None, help="generate at most this many words")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--tld", default="us", help="gTTS accent, e.g. us, co.uk")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.limit, args.lang, args.tld))
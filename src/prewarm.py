@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+from .database import init_db, get_existing_words, bulk_save_to_global_dict
+from .database.engine import engine
+from .services.llm import get_definition, get_definitions, LLMError
+
+# Usage: python -m src.prewarm top20k.txt [--concurrency 4] [--batch-size 10] [--chunk-size 200]
+# Defines every word of a frequency list that is not in the dictionary yet,
+# so real user queries almost never wait on the LLM. Safe to interrupt:
+# rerunning skips words already stored or recorded in the checkpoint. Words the
+# model files under another headword ("went" -> "go") are stored under that
+# headword and remembered as aliases in the checkpoint.
+
+# ─── CONFIG ──────────────────────────────────────────────
+CHECKPOINT_PATH = "prewarm_checkpoint.json"
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0      # seconds, doubled on every retry
+# ─────────────────────────────────────────────────────────
+
+
+def read_word_list(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        words = [line.split()[0].lower() for line in f if line.strip() and not line.startswith("#")]
+    return list(dict.fromkeys(words))  # dedupe, keep frequency order
+
+
+def load_checkpoint(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"done": 0, "failed": [], "aliases": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)  # atomic: never leaves a half-written checkpoint
+
+
+async def with_retry(fn, *args):
+    """Retry provider failures with jittered exponential backoff."""
+    for attempt in range(MAX_RETRIES):
+        try:
+            return await fn(*args)
+        except LLMError:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            delay = BACKOFF_BASE * 2 ** attempt
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+
+async def define_batch_with_retry(batch: list[str], limiter: asyncio.Semaphore) -> dict[str, dict | None]:
+    async with limiter:
+        try:
+            results = await with_retry(get_definitions, batch)
+        except LLMError:
+            return {}  # not recorded as failed, the next run tries again
+
+        # Items the batch could not define get one single-word attempt
+        for word in [w for w, data in results.items() if not data]:
+            try:
+                results[word] = await with_retry(get_definition, word)
+            except LLMError:
+                del results[word]
+    return results
+
+
+async def main(path: str, concurrency: int, batch_size: int, chunk_size: int, checkpoint_path: str):
+    await init_db()
+
+    checkpoint = load_checkpoint(checkpoint_path)
+    failed = set(checkpoint["failed"])
+    aliases: dict[str, str] = checkpoint.setdefault("aliases", {})   # query -> headword stored
+
+    words = [w for w in read_word_list(path) if w not in failed and w not in aliases]
+    existing = await get_existing_words(words)
+    missing = [w for w in words if w not in existing]
+    print(f"📦 {len(words)} words in list, {len(existing)} already cached, {len(missing)} to define")
+
+    limiter = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    for i in range(0, len(missing), chunk_size):
+        chunk = missing[i:i + chunk_size]
+        batches = [chunk[j:j + batch_size] for j in range(0, len(chunk), batch_size)]
+
+        results: dict[str, dict | None] = {}
+        for batch_results in await asyncio.gather(*(define_batch_with_retry(b, limiter) for b in batches)):
+            results.update(batch_results)
+
+        entries = [data for data in results.values() if data]
+        failed.update(w for w, data in results.items() if not data)
+        inserted = await bulk_save_to_global_dict(entries)
+        for query, data in results.items():
+            if data and data["word"].lower().strip() != query:
+                aliases[query] = data["word"].lower().strip()   # its own key never appears
+
+        checkpoint["done"] += len(entries)
+        checkpoint["failed"] = sorted(failed)
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        done = i + len(chunk)
+        rate = done / (time.perf_counter() - started)
+        print(f"⏳ {done}/{len(missing)} — {inserted} stored, {len(failed)} failed, {rate:.1f} words/s")
+
+    print("🎉 Pre-warm complete!")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-warm the global dictionary from a word list")
+    parser.add_argument("wordlist", help="file with one word per line, most frequent first")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel LLM requests")
+    parser.add_argument("--batch-size", type=int, default=10, help="words defined per LLM request")
+    parser.add_argument("--chunk-size", type=int, default=200, help="words per bulk insert/checkpoint")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    args = parser.parse_args()
+    asyncio.run(main(args.wordlist, args.concurrency, args.batch_size, args.chunk_size, args.checkpoint))
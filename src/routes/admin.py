@@ -7,7 +7,28 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import InlineKeyboardMarkup
 from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest
 
-from ..database import get_stats, get_all_user_ids, mark_user_inactive
+from ..database import (
+    get_stats,
+    get_all_user_ids,
+    mark_user_inactive,
+    get_definition_cache_stats,
+    get_negative_cache_stats,
+    get_user_registry_stats,
+    get_session_stats,
+    get_audio_stats,
+    get_grade_buffer_stats,
+)
+from ..services import (
+    get_lookup_stats,
+    get_llm_stats,
+    get_audio_store_stats,
+    get_http_stats,
+    get_word_audio_stats,
+    get_prefetch_stats,
+    get_review_queue_stats,
+    get_reminder_stats,
+)
+from ..core.bot import get_subscription_stats
 
 # ─── CONFIG ──────────────────────────────────────────────
 ADMIN_IDS = [6705677631, 7853044770]  # ← put your Telegram user_id here
@@ -26,6 +47,7 @@ def admin_panel_kb() -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
     kb.button(text="📊 Statistics", callback_data="admin_stats")
     kb.button(text="📢 Mailing", callback_data="admin_mailing")
+    kb.button(text="⚙️ Performance", callback_data="admin_perf")
     kb.adjust(2)
     return kb.as_markup()
 
@@ -79,6 +101,25 @@ async def handle_stats(callback: types.CallbackQuery):
     await callback.message.edit_text(text, parse_mode="HTML", reply_markup=kb.as_markup())
 
 
+# ─── Performance ─────────────────────────────────────────
+
+@router.callback_query(F.data == "admin_perf")
+async def handle_perf(callback: types.CallbackQuery):
+    if not is_admin(callback.from_user.id):
+        return
+    await callback.answer()
+
+    kb = InlineKeyboardBuilder()
+    kb.button(text="🔄 Refresh", callback_data="admin_perf")
+    kb.button(text="🔙 Back", callback_data="admin_back")
+    kb.adjust(2)
+
+    try:
+        await callback.message.edit_text(_perf_text(), parse_mode="HTML", reply_markup=kb.as_markup())
+    except TelegramBadRequest:
+        pass  # nothing changed since the last refresh
+
+
 # ─── Mailing ─────────────────────────────────────────────
 
 @router.callback_query(F.data == "admin_mailing")
@@ -195,6 +236,105 @@ async def _forward_message(bot: Bot, msg: types.Message, user_id: int):
     )
 
 
+def _perf_text() -> str:
+    lookup = get_lookup_stats()
+    cache = get_definition_cache_stats()
+    negative = get_negative_cache_stats()
+    llm = get_llm_stats()
+    users = get_user_registry_stats()
+    subs = get_subscription_stats()
+    db = get_session_stats()
+    reviews = get_review_queue_stats()
+    grades = get_grade_buffer_stats()
+    reminders = get_reminder_stats()
+    audio = get_audio_stats()
+    store = get_audio_store_stats()
+    prefetch = get_prefetch_stats()
+    http = get_http_stats()
+    scraper = get_word_audio_stats()
+
+    sections = [
+        "⚙️ <b>Performance</b>",
+        f"🤖 <b>LLM lookups</b>\n"
+        f"├ Calls made: <b>{lookup['llm_calls']}</b>\n"
+        f"├ Calls saved (coalesced): <b>{lookup['llm_calls_saved']}</b>\n"
+        f"├ Spelling suggestions shown: <b>{lookup['suggested']}</b>\n"
+        f"├ Skipped (known misses): <b>{lookup['negative_hits']}</b>\n"
+        f"├ Hedged: <b>{llm['hedged']}</b> (won by backup: {llm['hedge_wins']}), failovers: <b>{llm['failovers']}</b>\n"
+        f"└ In flight: <b>{lookup['in_flight']}</b>",
+    ]
+    for provider in llm["providers"]:
+        sections.append(
+            f"🚦 <b>{provider['name']}</b> <code>{provider['model']}</code> {'🟢' if provider['healthy'] else '🔴'}\n"
+            f"├ Requests: <b>{provider['requests']}</b>, errors: <b>{provider['errors']}</b>\n"
+            f"├ Latency p50/p95: <b>{provider['latency_p50']:.2f}s / {provider['latency_p95']:.2f}s</b>, "
+            f"first token p95: <b>{provider['first_token_p95']:.2f}s</b>\n"
+            f"├ Hedge after <b>{provider['hedge_delay']:.1f}s</b> "
+            f"(streams: <b>{provider['stream_hedge_delay']:.1f}s</b>)\n"
+            f"├ Active: <b>{provider['active']} / {provider['max_concurrent']}</b>, queued: <b>{provider['queue_depth']}</b>\n"
+            f"├ Queue wait p50/p95: <b>{provider['wait_p50']:.2f}s / {provider['wait_p95']:.2f}s</b>\n"
+            f"├ Wait histogram: {_histogram_line(provider['wait_buckets'])}\n"
+            f"└ Shed: <b>{provider['shed']}</b>, rate-limited: <b>{provider['throttled']}</b>"
+        )
+    sections += [
+        f"📖 <b>Definition cache</b>\n"
+        f"├ Size: <b>{cache['size']} / {cache['maxsize']}</b>\n"
+        f"├ Hit rate: <b>{cache['hit_rate']:.1%}</b> ({cache['hits']} hits, {cache['misses']} misses)\n"
+        f"└ Evictions: <b>{cache['evictions']}</b>, expired: <b>{cache['expirations']}</b>",
+        f"🚫 <b>Negative cache</b>\n"
+        f"└ Size: <b>{negative['size']} / {negative['maxsize']}</b>, evictions: <b>{negative['evictions']}</b>",
+        f"👥 <b>User registry</b>\n"
+        f"├ Known: <b>{users['known']}</b>, waiting to be saved: <b>{users['pending']}</b>\n"
+        f"└ Saved: <b>{users['flushed']}</b> in {users['flushes']} batches",
+        f"📢 <b>Subscription checks</b>\n"
+        f"├ Hit rate: <b>{subs['hit_rate']:.1%}</b> ({subs['size']} users cached)\n"
+        f"├ getChatMember calls: <b>{subs['api_calls']}</b> (errors: {subs['api_errors']}), "
+        f"saved: <b>{subs['api_calls_saved']}</b>\n"
+        f"└ Background refreshes: <b>{subs['refreshed']}</b> for {subs['active_users']} active users",
+        f"🗄 <b>DB sessions</b>\n"
+        f"├ Updates (one session each): <b>{db['units_of_work']}</b>\n"
+        f"└ Calls sharing it: <b>{db['reused']}</b>, standalone sessions: <b>{db['standalone']}</b>",
+        f"🧠 <b>Review queue</b>\n"
+        f"└ Cards served: <b>{reviews['cards']}</b> from <b>{reviews['pages']}</b> page reads "
+        f"in {reviews['sessions']} sessions",
+        f"📝 <b>Grade buffer</b>\n"
+        f"├ Graded: <b>{grades['graded']}</b>, waiting to be saved: <b>{grades['pending']}</b>\n"
+        f"├ Saved: <b>{grades['flushed']}</b> in {grades['flushes']} batches\n"
+        f"├ Review log: <b>{grades['logged']}</b> rows written, {grades['pending_reviews']} waiting\n"
+        f"└ Flush p50/p95: <b>{grades['flush_p50'] * 1000:.0f}ms / {grades['flush_p95'] * 1000:.0f}ms</b>",
+        f"🔔 <b>Review reminders</b>\n"
+        f"├ Sent: <b>{reminders['sent']}</b> of {reminders['due']} due users in {reminders['ticks']} scans "
+        f"({reminders['rescans']} full)\n"
+        f"├ Waiting: <b>{reminders['deferred']}</b> deferred, {reminders['queued']} queued "
+        f"(quiet hours {reminders['quiet']}, active {reminders['busy']}, too soon {reminders['too_soon']})\n"
+        f"└ Blocked: <b>{reminders['blocked']}</b>, failed: <b>{reminders['failed']}</b>, "
+        f"nothing due anymore: {reminders['nothing_due']}",
+        f"🔊 <b>Pronunciation audio</b>\n"
+        f"├ Sent by file_id: <b>{audio['reused']}</b>, uploaded: <b>{audio['uploaded']}</b>\n"
+        f"├ Stale ids replaced: <b>{audio['invalidated']}</b>\n"
+        f"├ Disk store: <b>{store['files']}</b> files, <b>{store['bytes'] / 2**20:.1f} / {store['max_bytes'] / 2**20:.0f} MB</b>\n"
+        f"├ Store hit rate: <b>{store['hit_rate']:.1%}</b>, generated: <b>{store['writes']}</b>, evicted: <b>{store['evictions']}</b>\n"
+        f"├ TTS jobs: <b>{store['pending']}</b> pending on {store['workers']} workers, "
+        f"shed: <b>{store['shed']}</b>, failed: <b>{store['failed']}</b>, coalesced: <b>{store['coalesced']}</b>\n"
+        f"├ TTS queue wait p50/p95: <b>{store['queue_wait']['p50']:.2f}s / {store['queue_wait']['p95']:.2f}s</b>\n"
+        f"├ Synthesis p50/p95: <b>{store['synthesis']['p50']:.2f}s / {store['synthesis']['p95']:.2f}s</b>\n"
+        f"└ Prefetch: <b>{prefetch['done']}</b> done, {prefetch['pending']} pending, "
+        f"{prefetch['skipped']} already warm, {prefetch['dropped'] + prefetch['expired']} dropped, {prefetch['failed']} failed",
+        f"🌐 <b>Outbound HTTP</b>\n"
+        f"├ Requests: <b>{http['requests']}</b>, errors: <b>{http['errors']}</b>\n"
+        f"├ Connections: <b>{http['connections_created']}</b> opened, <b>{http['connections_reused']}</b> reused "
+        f"({http['reuse_rate']:.0%})\n"
+        f"├ DNS cache: <b>{http['dns_cache_hits']}</b> hits, {http['dns_cache_misses']} misses\n"
+        f"└ Cambridge links cache: <b>{scraper['hit_rate']:.1%}</b> hit rate, "
+        f"{scraper['scrapes']} scrapes ({scraper['coalesced']} coalesced)",
+    ]
+    return "\n\n".join(sections)
+
+
+def _histogram_line(buckets: dict) -> str:
+    return " ".join(f"{label}:{count}" for label, count in buckets.items() if count) or "—"
+
+
 def _progress_bar(percent: int, length: int = 10) -> str:
     filled = int(length * percent / 100)
     return "▰" * filled + "▱" * (length - filled)
\ No newline at end of file
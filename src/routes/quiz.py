@@ -1,7 +1,8 @@
 from aiogram import Router, types, F
 from aiogram.fsm.context import FSMContext
 
-from ..database import get_due_words, get_study_details, update_anki_progress
+from ..database import REVIEW_GRADES, get_study_details, update_anki_progress
+from ..services.review_queue import reset_queue, next_card, drop_card, queue_fields
 from ..keyboards import main_menu_kb, quiz_show_kb, quiz_grade_kb
 
 router = Router()
@@ -9,48 +10,18 @@ router = Router()
 
 @router.callback_query(F.data == "quiz")
 async def start_quiz(cb: types.CallbackQuery, state: FSMContext):
-    user_id = cb.from_user.id
-
-    due_items = await get_due_words(user_id)
-
-    state_data = await state.get_data()
-    failed_ids: list[int] = state_data.get("failed_words", [])
-
-    due_word_ids = {uw.id for uw, _ in due_items}
-    unique_failed_ids = [wid for wid in failed_ids if wid not in due_word_ids]
-
-    user_word = None
-    dict_entry = None
-    title = ""
-
-    # PRIORITY 1: Regular due words (skip ones already in failed list)
-    for uw, de in due_items:
-        if uw.id not in failed_ids:
-            user_word, dict_entry = uw, de
-            title = "🃏 <b>Flashcard</b>"
-            break
-
-    # PRIORITY 2: Due words that are also in failed list
-    if user_word is None:
-        for uw, de in due_items:
-            user_word, dict_entry = uw, de
-            title = "🔄 <b>Re-learning Round</b>"
-            break
-
-    # PRIORITY 3: Failed words not yet due
-    if user_word is None and unique_failed_ids:
-        next_id = unique_failed_ids[0]
-        result = await get_study_details(next_id)
-        if not result:
-            unique_failed_ids.pop(0)
-            await state.update_data(failed_words=unique_failed_ids)
-            return await start_quiz(cb, state)
-        user_word, dict_entry = result
-        title = "🔄 <b>Re-learning Round</b>"
-
-    # PRIORITY 4: Nothing left
-    if user_word is None:
-        await state.update_data(failed_words=[])
+    data = await state.get_data()
+    reset_queue(data)  # fresh session: read the due cards from the top
+    await _show_next_card(cb, state, data)
+
+
+async def _show_next_card(cb: types.CallbackQuery, state: FSMContext, data: dict):
+    card, relearning = await next_card(cb.from_user.id, data)
+
+    # Nothing left
+    if card is None:
+        data["failed_words"] = []
+        await state.update_data(queue_fields(data))
         await cb.message.edit_text(
             "<b>🎉 Session Complete!</b>\n"
             "You have no more words to review right now.\n\n"
@@ -60,11 +31,15 @@ async def start_quiz(cb: types.CallbackQuery, state: FSMContext):
         )
         return
 
+    await state.update_data(queue_fields(data))  # other keys (last_word) may have moved meanwhile
+    word_id, word, level, pronunciation = card
+    title = "🔄 <b>Re-learning Round</b>" if relearning else "🃏 <b>Flashcard</b>"
+
     await cb.message.edit_text(
         f"{title}\n\n"
-        f"🚩 <b>{dict_entry.word.upper()}</b>\n\n"
-        f"✨ {dict_entry.level}\n 🔊 Pronunciation: <code>{dict_entry.pronunciation}</code>",
-        reply_markup=quiz_show_kb(user_word.id),
+        f"🚩 <b>{word.upper()}</b>\n\n"
+        f"✨ {level}\n 🔊 Pronunciation: <code>{pronunciation}</code>",
+        reply_markup=quiz_show_kb(word_id),
         parse_mode="HTML"
     )
     await cb.answer()
@@ -100,11 +75,15 @@ async def show_definition(cb: types.CallbackQuery):
 async def handle_quiz_grade(cb: types.CallbackQuery, state: FSMContext):
     _, word_id_str, grade = cb.data.split(":")
     word_id = int(word_id_str)
+    if grade not in REVIEW_GRADES:   # an old or forged button
+        await cb.answer("⚠️ Unknown answer, please try again.", show_alert=True)
+        return
 
     await update_anki_progress(word_id, grade)
 
     data = await state.get_data()
-    failed_list: list[int] = data.get("failed_words", [])
+    drop_card(data, word_id)
+    failed_list: list[int] = data.setdefault("failed_words", [])
 
     if grade == "again":
         if word_id not in failed_list:
@@ -113,7 +92,6 @@ async def handle_quiz_grade(cb: types.CallbackQuery, state: FSMContext):
         if word_id in failed_list:
             failed_list.remove(word_id)
 
-    await state.update_data(failed_words=failed_list)
     await cb.answer(f"{'❌' if grade == 'again' else '✅'} {grade.capitalize()}")
 
-    await start_quiz(cb, state)
\ No newline at end of file
+    await _show_next_card(cb, state, data)
\ No newline at end of file
@@ -1,16 +1,36 @@
 import asyncio
-import aiohttp
-from aiogram import Router, types, F
+import time
+from aiogram import Router, types, F, html
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 from aiogram.fsm.context import FSMContext
 
+from ..config import settings
 from ..core.bot import is_subscribed, subscribe_kb
-from ..database import add_user, get_cached_definition, save_to_global_dict
-from ..services import get_definition, generate_tts
+from ..database import (
+    add_user,
+    get_cached_definition,
+    release_session,
+    get_audio_file_id,
+    save_audio_file_id,
+    forget_audio_file_id,
+)
+from ..services import (
+    find_cached_definition,
+    define_word,
+    suggest_spelling,
+    tts_path,
+    http_session,
+    schedule_audio_prefetch,
+    LLMOverloaded,
+)
 from ..services.word_audio import get as get_audio 
-from ..keyboards import add_word_kb, back_to_menu_kb
+from ..keyboards import add_word_kb, back_to_menu_kb, did_you_mean_kb
 
 router = Router()
 
+AUDIO_ACCENT = "us"   # gTTS tld; part of the audio file_id key
+BUSY_TEXT = "⏳ <b>Lots of people are searching right now.</b>\n<i>Please try again in a few seconds.</i>"
+
 
 @router.message(F.text)
 async def handle_search(msg: types.Message, state: FSMContext):
@@ -31,13 +51,70 @@ async def handle_search(msg: types.Message, state: FSMContext):
 
     wait_msg = await msg.answer("🔍 <i>Searching...</i>", parse_mode="HTML")
 
-    data = await get_cached_definition(word)
+    lemma, data = await find_cached_definition(word)
     if not data:
-        data = await get_definition(word)
-        print(f"Fetched from API: {data}")  # Debug log
-        if data:
-            await save_to_global_dict(data)
+        # Probably a typo of a word we already know — ask before paying for the LLM
+        suggestions = suggest_spelling(lemma)
+        if suggestions:
+            await wait_msg.edit_text(
+                f"🤔 <b>Did you mean...</b>\n\n<i>No exact match for</i> <code>{html.quote(word)}</code>",
+                reply_markup=did_you_mean_kb(suggestions, lemma),
+                parse_mode="HTML"
+            )
+            return
+        await release_session()  # don't hold a DB connection while the LLM writes
+        try:
+            data = await define_word(lemma, on_partial=_progressive_editor(wait_msg))
+        except LLMOverloaded:
+            await wait_msg.edit_text(BUSY_TEXT, parse_mode="HTML")
+            return
+
+    await _show_definition(wait_msg, data, state)
+
+
+@router.callback_query(F.data.startswith("lookup:"))
+async def handle_lookup(callback: types.CallbackQuery, state: FSMContext):
+    await callback.answer()
 
+    word = callback.data.split(":", 1)[1]
+    await callback.message.edit_text("🔍 <i>Searching...</i>", parse_mode="HTML")
+
+    lemma, data = await find_cached_definition(word)
+    if not data:
+        await release_session()
+        try:
+            data = await define_word(lemma, on_partial=_progressive_editor(callback.message))
+        except LLMOverloaded:
+            await callback.message.edit_text(BUSY_TEXT, parse_mode="HTML")
+            return
+    await _show_definition(callback.message, data, state)
+
+
+def _progressive_editor(wait_msg: types.Message):
+    """Edits the placeholder with streamed fields, at most once per STREAM_EDIT_INTERVAL."""
+    last_edit = 0.0
+
+    async def on_partial(fields: dict):
+        nonlocal last_edit
+        now = time.monotonic()
+        if "word" not in fields or now - last_edit < settings.STREAM_EDIT_INTERVAL:
+            return
+        last_edit = now
+
+        lines = [f"🇬🇧 <b>{fields['word']}</b>   <code>{fields.get('level', '…')}</code>"]
+        if "definition" in fields:
+            lines.append(f"\n📖 <b>Definition:</b>\n{fields['definition']}")
+        if "example" in fields:
+            lines.append(f"\n✍️ <b>Example:</b>\n<i>{fields['example']}</i>")
+        lines.append("\n⏳ <i>Writing...</i>")
+
+        try:
+            await wait_msg.edit_text("\n".join(lines), parse_mode="HTML")
+        except (TelegramBadRequest, TelegramRetryAfter):
+            pass  # unchanged text or edit flood limit — the final edit still lands
+
+
+async def _show_definition(wait_msg: types.Message, data: dict | None, state: FSMContext):
     if not data:
         await wait_msg.edit_text("❌ <b>Word not found.</b>", parse_mode="HTML")
         return
@@ -61,6 +138,7 @@ async def handle_search(msg: types.Message, state: FSMContext):
     )
 
     await wait_msg.edit_text(response_text, reply_markup=add_word_kb(data["word"]), parse_mode="HTML")
+    schedule_audio_prefetch(data["word"], tld=AUDIO_ACCENT)  # so a 🔊 tap finds it ready
 
 
 # ─── Audio callback ───────────────────────────────────────────────────────────
@@ -69,29 +147,47 @@ async def handle_play_audio(callback: types.CallbackQuery):
     await callback.answer()
 
     word = callback.data.split(":", 1)[1]
-
-    wait_msg = await callback.message.answer("🔊 <i>Loading pronunciation...</i>", parse_mode="HTML")
+    caption = f"🔊 Pronunciation of <b>{word}</b>"
 
     data = await get_cached_definition(word)
     audio_url = data.get("audio") if data else None
+    source = "url" if audio_url else "tts"
+
+    # Played before: Telegram still has the file, send it by id
+    file_id = await get_audio_file_id(word, AUDIO_ACCENT, source)
+    if file_id:
+        try:
+            await callback.message.answer_audio(
+                audio=file_id, caption=caption, parse_mode="HTML", reply_markup=back_to_menu_kb()
+            )
+            return
+        except TelegramBadRequest as e:
+            print(f"Stale audio file_id for '{word}': {e}")
+            await forget_audio_file_id(word, AUDIO_ACCENT, source)
+
+    wait_msg = await callback.message.answer("🔊 <i>Loading pronunciation...</i>", parse_mode="HTML")
 
     try:
         if audio_url:
-            headers = {"User-Agent": "Mozilla/5.0 (Windows NT 6.1; Win64; x64)"}
-            async with aiohttp.ClientSession(headers=headers) as session:
-                async with session.get(audio_url) as resp:
-                    audio_bytes = await resp.read()
+            session = await http_session()
+            async with session.get(audio_url) as resp:
+                audio_bytes = await resp.read()
+            audio_file = types.BufferedInputFile(audio_bytes, filename=f"{word}.mp3")
         else:
-            audio_bytes = await generate_tts(word)
+            # Streamed from the on-disk store, never held in memory
+            audio_file = types.FSInputFile(await tts_path(word, tld=AUDIO_ACCENT), filename=f"{word}.mp3")
 
-        audio_file = types.BufferedInputFile(audio_bytes, filename=f"{word}.mp3")
         await wait_msg.delete()
-        await callback.message.answer_audio(
+        sent = await callback.message.answer_audio(
             audio=audio_file,
-            caption=f"🔊 Pronunciation of <b>{word}</b>",
+            caption=caption,
             parse_mode="HTML",
             reply_markup=back_to_menu_kb()
         )
     except Exception:
         await wait_msg.delete()
-        await callback.message.answer("😔 Sorry, I couldn't load the audio right now.")
\ No newline at end of file
+        await callback.message.answer("😔 Sorry, I couldn't load the audio right now.")
+        return
+
+    if sent.audio:
+        await save_audio_file_id(word, AUDIO_ACCENT, source, sent.audio.file_id)
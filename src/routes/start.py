@@ -1,11 +1,11 @@
 import os
 from aiogram import Router, types
-from aiogram.filters import CommandStart, Command
+from aiogram.filters import CommandStart, Command, CommandObject
 from aiogram.types import FSInputFile
 import asyncio
 
-from ..core.bot import is_subscribed, subscribe_kb
-from ..database import add_user
+from ..core.bot import is_subscribed, forget_subscription, subscribe_kb
+from ..database import add_user, set_utc_offset
 from ..keyboards import main_menu_kb
 from ..config import settings
 
@@ -14,6 +14,7 @@ router = Router()
 
 @router.callback_query(lambda cb: cb.data == "check_subscription")
 async def check_subscription(cb: types.CallbackQuery):
+    forget_subscription(cb.from_user.id)  # they say they just joined: ask Telegram again
     if await is_subscribed(cb.from_user.id):
         await cb.message.delete()
         await cb.message.answer(
@@ -60,6 +61,31 @@ async def start(msg: types.Message):
         )
 
 
+@router.message(Command("timezone"))
+async def set_timezone(msg: types.Message, command: CommandObject):
+    """/timezone +5 or /timezone -3:30 — so review reminders respect the user's night."""
+    arg = (command.args or "").strip().upper().removeprefix("UTC")
+    try:
+        sign = -1 if arg.startswith("-") else 1
+        hours, _, minutes = arg.lstrip("+-").partition(":")
+        offset = sign * (int(hours) * 60 + int(minutes or 0))
+        if not -12 * 60 <= offset <= 14 * 60:
+            raise ValueError
+    except ValueError:
+        await msg.answer(
+            "🕒 Send your UTC offset, e.g. <code>/timezone +5</code> or <code>/timezone -3:30</code>",
+            parse_mode="HTML"
+        )
+        return
+
+    await set_utc_offset(msg.from_user.id, offset)
+    await msg.answer(
+        f"✅ Timezone set to <b>UTC{'-' if offset < 0 else '+'}{abs(offset) // 60}:{abs(offset) % 60:02d}</b>\n"
+        f"<i>No review reminders between {settings.REMINDER_QUIET_START}:00 and {settings.REMINDER_QUIET_END}:00.</i>",
+        parse_mode="HTML"
+    )
+
+
 
 
 @router.message(Command("db"))
@@ -1,9 +1,54 @@
-from .llm import get_definition
-from .word_audio import get
-from .tts import generate_tts
+from .llm import get_definition, get_definitions, get_llm_stats, LLMError, LLMOverloaded
+from .http import start_http, http_session, close_http, get_http_stats
+from .word_audio import get, get_word_audio_stats
+from .tts import (
+    generate_tts,
+    generate_tts_batch,
+    tts_path,
+    has_tts,
+    load_audio_store,
+    get_audio_store_stats,
+    TTSOverloaded,
+)
+from .review_queue import get_review_queue_stats
+from .prefetch import schedule_audio_prefetch, cancel_prefetches, get_prefetch_stats
+from .reminders import run_reminders, get_reminder_stats
+from .lookup import (
+    find_cached_definition,
+    define_word,
+    lookup_definition,
+    suggest_spelling,
+    get_lookup_stats,
+)
 
 __all__ = [
-    "get_definition",  
+    "get_definition",
+    "get_definitions",
+    "get_llm_stats",
+    "LLMError",
+    "LLMOverloaded",
+    "start_http",
+    "http_session",
+    "close_http",
+    "get_http_stats",
     "get",
-    "generate_tts"
+    "get_word_audio_stats",
+    "generate_tts",
+    "generate_tts_batch",
+    "tts_path",
+    "has_tts",
+    "load_audio_store",
+    "get_audio_store_stats",
+    "TTSOverloaded",
+    "get_review_queue_stats",
+    "schedule_audio_prefetch",
+    "cancel_prefetches",
+    "get_prefetch_stats",
+    "run_reminders",
+    "get_reminder_stats",
+    "find_cached_definition",
+    "define_word",
+    "lookup_definition",
+    "suggest_spelling",
+    "get_lookup_stats",
 ]
\ No newline at end of file
@@ -0,0 +1,74 @@
+import aiohttp
+
+from ..config import settings
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; Win64; x64)'}
+
+# One pooled client for the whole process: connections, DNS answers and TLS
+# sessions are reused instead of being set up again on every request
+_session: aiohttp.ClientSession | None = None
+_http_stats = {
+    "requests": 0,
+    "errors": 0,
+    "connections_created": 0,
+    "connections_reused": 0,
+    "dns_cache_hits": 0,
+    "dns_cache_misses": 0,
+}
+
+
+def _count(name: str):
+    async def on_event(session, ctx, params):
+        _http_stats[name] += 1
+    return on_event
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_count("requests"))
+    trace.on_request_exception.append(_count("errors"))
+    trace.on_connection_create_end.append(_count("connections_created"))
+    trace.on_connection_reuseconn.append(_count("connections_reused"))
+    trace.on_dns_cache_hit.append(_count("dns_cache_hits"))
+    trace.on_dns_cache_miss.append(_count("dns_cache_misses"))
+    return trace
+
+
+async def start_http() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_MAX_CONNECTIONS,
+            limit_per_host=settings.HTTP_MAX_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.HTTP_KEEPALIVE,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+            trace_configs=[_trace_config()],
+        )
+    return _session
+
+
+async def http_session() -> aiohttp.ClientSession:
+    """The shared client session; started on first use for CLIs that skip start_http()."""
+    if _session is None or _session.closed:
+        return await start_http()
+    return _session
+
+
+async def close_http():
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+def get_http_stats() -> dict:
+    opened = _http_stats["connections_created"] + _http_stats["connections_reused"]
+    return {
+        **_http_stats,
+        "reuse_rate": _http_stats["connections_reused"] / opened if opened else 0.0,
+    }
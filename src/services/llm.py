@@ -1,12 +1,15 @@
+import asyncio
 import json
-from openai import AsyncOpenAI
+from typing import Awaitable, Callable
 from ..config import settings
+from .providers import LLMError, LLMOverloaded, Provider, ordered_providers, providers
 
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY.get_secret_value())
+MAX_BATCH_SIZE = 20      # words per chat completion in get_definitions
+COMPLETION_TOKENS = 250  # expected answer size per word, for the token budget
 
+_hedge_counters = {"hedged": 0, "hedge_wins": 0, "failovers": 0}
 
-async def get_definition(word: str):
-    prompt = f"""
+RULES = """
     Role: You are a friendly dictionary designed for B1-C2 learners.
 
     Rules for generating output:
@@ -20,9 +23,10 @@ async def get_definition(word: str):
     8. Assign a **CEFR level** (B1, B2, C1, or C2) based on difficulty.
     9. Rate the word's importance from **0 to 10** (10 = essential/very common, above 5 = extremely rare).
     10. Return **JSON only** with no extra text.
+    11. If the given text is not a real English word or phrase (a name, gibberish, a URL...), return {"word": null}.
 
     Example output structure:
-    {{
+    {
         "word": "abandon",
         "level": "B1",
         "importance_rate": 8,
@@ -32,19 +36,242 @@ async def get_definition(word: str):
         "pronunciation": "/əˈbændən/",
         "synonyms": ["leave", "give up"],
         "hint": "Think: leave forever",
-    }}
+    }
+"""
 
+REQUIRED_FIELDS = ("word", "definition", "example")
+
+
+def _is_not_a_word(data) -> bool:
+    """The model's explicit "not a word" answer (rule 11), as opposed to a broken one."""
+    return isinstance(data, dict) and "word" in data and data["word"] is None
+
+
+def _validate(data) -> dict | None:
+    """A definition is usable only if every required field is a non-empty string."""
+    if not isinstance(data, dict):
+        return None
+    for field in REQUIRED_FIELDS:
+        if not isinstance(data.get(field), str) or not data[field].strip():
+            return None
+    return data
+
+
+def _usable_definition(data) -> bool:
+    return _is_not_a_word(data) or _validate(data) is not None
+
+
+def _usable_batch(data) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("items"), list)
+
+
+async def _hedged(
+    call: Callable[[Provider, Callable[[], bool]], Awaitable[dict]],
+    usable: Callable[[dict], bool],
+    hedge: bool = True,
+    streaming: bool = False,
+) -> dict:
+    """Ask the best provider; if it is slower than its own p95, also ask the next one.
+
+    The first usable answer wins and the other request is cancelled; an
+    answer ``usable`` rejects counts as a failure and the other request is
+    still awaited. A provider that fails outright is skipped (failover)
+    without waiting for the delay. Streams are hedged only until the first
+    token: ``call`` gets a ``claim`` callback, and the first stream to claim
+    keeps going while the others are cancelled.
+    """
+    candidates = ordered_providers()
+    tasks: dict[asyncio.Task, Provider] = {}
+    hedges: set[asyncio.Task] = set()
+    claimed: list[asyncio.Task] = []     # the stream that produced output first
+    claim_made = asyncio.Event()
+    last_error: Exception | None = None
+
+    def launch(provider: Provider) -> asyncio.Task:
+        def claim() -> bool:
+            if not claimed:
+                claimed.append(task)
+                claim_made.set()
+            return claimed[0] is task
+
+        task = asyncio.create_task(call(provider, claim))
+        tasks[task] = provider
+        return task
+
+    launch(candidates.pop(0))
+    try:
+        while tasks:
+            if claimed:  # a stream is talking to the user: the others are moot
+                for task in [t for t in tasks if t is not claimed[0]]:
+                    task.cancel()
+                    del tasks[task]
+                if not tasks:
+                    break
+
+            waiting_on = next(iter(tasks.values()))
+            can_hedge = hedge and candidates and len(tasks) == 1 and not claimed
+            timeout = waiting_on.hedge_delay(streaming) if can_hedge else None
+
+            claim_made.clear()
+            claim_waiter = asyncio.create_task(claim_made.wait())
+            done, _ = await asyncio.wait([*tasks, claim_waiter], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            claim_waiter.cancel()
+            done.discard(claim_waiter)
+
+            if not done:
+                if not claimed:  # slow: hedge with the next provider
+                    _hedge_counters["hedged"] += 1
+                    hedges.add(launch(candidates.pop(0)))
+                continue
+
+            for task in done:
+                provider = tasks.pop(task)
+                if task.cancelled():  # a stream that lost the hedge
+                    continue
+                if claimed and claimed[0] is task:
+                    claimed.clear()   # whatever happens next, the claim is over
+                try:
+                    result = task.result()
+                except Exception as e:
+                    print(f"LLM provider {provider.name} failed: {e}")
+                    last_error = e
+                    continue
+                if not usable(result):
+                    print(f"LLM provider {provider.name} gave an unusable answer")
+                    last_error = LLMError(f"{provider.name}: unusable answer")
+                    continue
+                if task in hedges:
+                    _hedge_counters["hedge_wins"] += 1
+                return result
+
+            if not tasks and candidates:  # everything in flight failed: fail over
+                _hedge_counters["failovers"] += 1
+                launch(candidates.pop(0))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    raise last_error
+
+
+async def _complete(prompt: str, completion_tokens: int = COMPLETION_TOKENS, hedge: bool = True) -> dict:
+    return await _hedged(
+        lambda p, _: p.complete(prompt, completion_tokens),
+        _usable_definition,
+        hedge=hedge and settings.LLM_HEDGING,
+    )
+
+
+async def _stream(prompt: str, on_partial: Callable[[dict], Awaitable[None]]) -> dict:
+    return await _hedged(
+        lambda p, claim: p.stream(prompt, COMPLETION_TOKENS, on_partial, claim),
+        _usable_definition,
+        hedge=settings.LLM_HEDGING,
+        streaming=True,
+    )
+
+
+async def get_definition(word: str, on_partial: Callable[[dict], Awaitable[None]] | None = None):
+    """Define one word.
+
+    Returns ``None`` only when the model says the text is not a word; raises
+    ``LLMError`` when the request fails or the answer is malformed (invalid
+    JSON, missing fields), since that says nothing about the word.
+    With ``on_partial`` (and LLM_STREAMING on) the answer is streamed and the
+    callback receives the fields parsed so far every time a new one completes.
+    """
+    prompt = f"""{RULES}
     Your task:
     Given the word: "{word}", generate the JSON output following the rules above.
     """
 
     try:
-        resp = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
-        )
-        return json.loads(resp.choices[0].message.content)
+        if on_partial is not None and settings.LLM_STREAMING:
+            data = await _stream(prompt, on_partial)
+        else:
+            data = await _complete(prompt)
+    except json.JSONDecodeError as e:
+        print(f"LLM returned invalid JSON for '{word}': {e}")
+        raise LLMError(f"invalid JSON for '{word}'") from e
+    except LLMError:
+        raise
     except Exception as e:
         print(f"LLM Error: {e}")
-        return None
\ No newline at end of file
+        raise LLMError(str(e)) from e
+
+    if _is_not_a_word(data):
+        return None
+    definition = _validate(data)
+    if definition is None:
+        raise LLMError(f"unusable definition for '{word}'")
+    return definition
+
+
+def get_llm_stats() -> dict:
+    return {
+        **_hedge_counters,
+        "providers": [p.stats() for p in providers],
+    }
+
+
+async def _define_batch(words: list[str]) -> dict[str, dict | None]:
+    word_list = "\n".join(f"- {w}" for w in words)
+    prompt = f"""{RULES}
+    Your task:
+    Define EACH of the words below, following the rules above for every word.
+    Return one JSON object of the form {{"items": [...]}} with one object per word,
+    in the same order, and add a "query" field holding the word exactly as given.
+
+    Words:
+    {word_list}
+    """
+
+    results: dict[str, dict | None] = dict.fromkeys(words)
+    try:
+        # Batches are throughput work, hedging them would only double the bill
+        items = (await _hedged(
+            lambda p, _: p.complete(prompt, COMPLETION_TOKENS * len(words), record_latency=False),
+            _usable_batch,
+            hedge=False,
+        ))["items"]
+    except json.JSONDecodeError as e:
+        print(f"LLM returned invalid batch JSON: {e}")
+        return results
+    except LLMError:
+        raise
+    except Exception as e:
+        print(f"LLM Batch Error: {e}")
+        raise LLMError(str(e)) from e
+
+    if not isinstance(items, list):
+        return results
+
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        query = str(item.pop("query", "")).strip().lower()
+        if query not in results:
+            # Echo dropped or mangled: trust the headword only if it is a word we
+            # asked for. Never go by position, a skipped word would shift the rest
+            # onto the wrong headwords; unmatched words stay None and are retried.
+            query = str(item.get("word", "")).strip().lower()
+        if query in results and results[query] is None:
+            results[query] = _validate(item)
+
+    return results
+
+
+async def get_definitions(words: list[str]) -> dict[str, dict | None]:
+    """Define many words with one chat completion per MAX_BATCH_SIZE words.
+
+    Every item is validated on its own: words the model skipped or answered
+    badly map to ``None`` while the rest of the batch is still returned.
+    Raises ``LLMError`` if a request fails outright.
+    """
+    words = list(dict.fromkeys(w.strip().lower() for w in words if w.strip()))
+    batches = [words[i:i + MAX_BATCH_SIZE] for i in range(0, len(words), MAX_BATCH_SIZE)]
+
+    results: dict[str, dict | None] = {}
+    for batch_result in await asyncio.gather(*(_define_batch(b) for b in batches)):
+        results.update(batch_result)
+    return results
@@ -0,0 +1,88 @@
+from typing import Awaitable, Callable
+from ..database import (
+    get_cached_definition,
+    save_to_global_dict,
+    resolve_lemma,
+    suggest_words,
+    is_known_miss,
+    remember_miss,
+)
+from ..utils import SingleFlight
+from .llm import get_definition, LLMError, LLMOverloaded
+
+# One LLM call + DB write per word, no matter how many users ask at once
+_inflight = SingleFlight()
+_counters = {"suggested": 0, "negative_hits": 0}
+
+
+async def _define_and_store(word: str, on_partial=None) -> dict | None:
+    # Another flight may have stored the word between our miss and now
+    data = await get_cached_definition(word)
+    if data:
+        return data
+
+    try:
+        data = await get_definition(word, on_partial=on_partial)
+    except LLMOverloaded:
+        raise  # shed: the caller tells the user to retry shortly
+    except LLMError:
+        return None  # provider trouble or a broken answer says nothing about the word itself
+
+    print(f"Fetched from API: {data}")  # Debug log
+    if data:
+        await save_to_global_dict(data)
+    else:
+        await remember_miss(word)  # the model said it is not a word
+    return data
+
+
+async def find_cached_definition(word: str) -> tuple[str, dict | None]:
+    """Normalize a query and look it up without calling the LLM.
+
+    Returns the canonical headword together with the cached entry, if any.
+    """
+    word = word.strip().lower()
+    lemma = resolve_lemma(word)  # "running", "ran" → "run"
+
+    data = await get_cached_definition(lemma)
+    if not data and lemma != word:
+        data = await get_cached_definition(word)  # rows saved before the index existed
+    return lemma, data
+
+
+async def define_word(word: str, on_partial: Callable[[dict], Awaitable[None]] | None = None) -> dict | None:
+    """Define a word with the LLM and store it.
+
+    Concurrent calls for the same word join the first one; only that first
+    caller's ``on_partial`` receives streamed fields. Raises ``LLMOverloaded``
+    when the LLM governor sheds the request.
+    """
+    if is_known_miss(word):
+        _counters["negative_hits"] += 1
+        return None
+    return await _inflight.do(word, _define_and_store, word, on_partial)
+
+
+async def lookup_definition(word: str) -> dict | None:
+    lemma, data = await find_cached_definition(word)
+    if data:
+        return data
+    return await define_word(lemma)
+
+
+def suggest_spelling(word: str) -> list[str]:
+    suggestions = suggest_words(word)
+    if suggestions:
+        _counters["suggested"] += 1
+    return suggestions
+
+
+def get_lookup_stats() -> dict:
+    stats = _inflight.stats()
+    return {
+        "llm_calls": stats["executed"],
+        "llm_calls_saved": stats["coalesced"],
+        "in_flight": stats["in_flight"],
+        "suggested": _counters["suggested"],
+        "negative_hits": _counters["negative_hits"],
+    }
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from ..config import settings
+from ..database import get_audio_file_id
+from .tts import has_tts, tts_has_capacity, tts_path
+
+# Pronunciation audio is generated right after a definition is shown, so
+# the 🔊 tap finds it ready. Prefetches are best-effort: they only use idle
+# TTS workers, are capped in number, and are dropped when they get stale.
+# A tap during a prefetch joins it through tts_path's SingleFlight.
+_limiter = asyncio.Semaphore(settings.PREFETCH_CONCURRENCY)
+_tasks: dict[tuple[str, str, str], asyncio.Task] = {}
+_prefetch_stats = {"scheduled": 0, "skipped": 0, "dropped": 0, "expired": 0, "done": 0, "failed": 0}
+
+
+def schedule_audio_prefetch(word: str, lang: str = "en", tld: str = "us"):
+    key = (word, lang, tld)
+    if key in _tasks or has_tts(word, lang, tld):
+        _prefetch_stats["skipped"] += 1
+        return
+    if len(_tasks) >= settings.PREFETCH_MAX_PENDING:
+        _prefetch_stats["dropped"] += 1
+        return
+
+    _prefetch_stats["scheduled"] += 1
+    task = asyncio.create_task(_prefetch(key, time.monotonic()))
+    _tasks[key] = task
+    task.add_done_callback(lambda _: _tasks.pop(key, None))
+
+
+async def _prefetch(key: tuple[str, str, str], scheduled_at: float):
+    word, lang, tld = key
+    async with _limiter:
+        if time.monotonic() - scheduled_at > settings.PREFETCH_MAX_AGE:
+            _prefetch_stats["expired"] += 1  # the user has moved on
+            return
+        if not tts_has_capacity():
+            _prefetch_stats["dropped"] += 1  # real taps are waiting, stay out of their way
+            return
+        try:
+            if await get_audio_file_id(word, tld, "tts", count=False):
+                _prefetch_stats["skipped"] += 1  # Telegram already has it
+                return
+            await tts_path(word, lang, tld)
+        except Exception as e:
+            _prefetch_stats["failed"] += 1
+            print(f"Audio prefetch failed for '{word}': {e}")
+            return
+    _prefetch_stats["done"] += 1
+
+
+def cancel_prefetches():
+    for task in list(_tasks.values()):
+        task.cancel()
+
+
+def get_prefetch_stats() -> dict:
+    return {**_prefetch_stats, "pending": len(_tasks)}
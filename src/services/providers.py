@@ -0,0 +1,224 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+
+from groq import AsyncGroq
+from openai import AsyncOpenAI
+
+from ..config import settings
+from ..utils import RateGovernor, Overloaded, Histogram
+from ..utils.partial_json import parse_partial_object
+
+# ─── CONFIG ──────────────────────────────────────────────
+FAILURES_BEFORE_DOWN = 3     # consecutive errors that take a provider out
+DOWN_FOR = 30.0              # seconds before a downed provider is tried again
+HEDGE_MIN_SAMPLES = 20       # below this, use DEFAULT_HEDGE_DELAY
+DEFAULT_HEDGE_DELAY = 3.0
+MIN_HEDGE_DELAY = 0.5
+# ─────────────────────────────────────────────────────────
+
+
+class LLMError(Exception):
+    """The provider could not be reached or failed; worth retrying later."""
+
+
+class LLMOverloaded(LLMError):
+    """Shed by the governor: too many requests right now, retry shortly."""
+
+
+def _is_rate_limit(e: Exception) -> bool:
+    return getattr(e, "status_code", None) == 429
+
+
+def _retry_after(e: Exception) -> float:
+    response = getattr(e, "response", None)
+    headers = response.headers if response is not None else {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        return float(headers.get("retry-after", 1.0))
+    except ValueError:
+        return 1.0
+
+
+class Provider:
+    """One OpenAI-compatible chat completion backend with its own budget and health."""
+
+    def __init__(self, name: str, client, model: str):
+        self.name = name
+        self.client = client
+        self.model = model
+        # Every request goes through the governor, so a burst of searches
+        # queues (or is told to retry) instead of tripping the rate limit
+        self.governor = RateGovernor(
+            max_concurrent=settings.LLM_MAX_CONCURRENT,
+            rpm=settings.LLM_RPM,
+            tpm=settings.LLM_TPM,
+            max_queue=settings.LLM_MAX_QUEUE,
+            queue_timeout=settings.LLM_QUEUE_TIMEOUT,
+        )
+        self.latency = Histogram()        # single-word, non-streamed completions only
+        self.first_token = Histogram()    # streams: time until the first content arrives
+        self.requests = 0
+        self.errors = 0
+        self._consecutive_failures = 0
+        self._down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def hedge_delay(self, streaming: bool = False) -> float:
+        """How long to wait for this provider before asking another one.
+
+        The p95 of a full answer, or for streams the p95 time to the first token.
+        """
+        histogram = self.first_token if streaming else self.latency
+        if histogram.count < HEDGE_MIN_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        return max(MIN_HEDGE_DELAY, histogram.percentile(0.95))
+
+    def _record_success(self, seconds: float | None):
+        if seconds is not None:
+            self.latency.observe(seconds)
+        self._consecutive_failures = 0
+
+    def _record_failure(self):
+        self.errors += 1
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= FAILURES_BEFORE_DOWN:
+            self._down_until = time.monotonic() + DOWN_FOR
+            print(f"LLM provider {self.name} marked down for {DOWN_FOR:.0f}s")
+
+    @asynccontextmanager
+    async def _governed(self, prompt: str, completion_tokens: int):
+        estimate = len(prompt) // 4 + completion_tokens
+        try:
+            async with self.governor.slot(estimate):
+                yield estimate
+        except Overloaded as e:
+            raise LLMOverloaded(f"{self.name}: {e}") from e
+
+    @asynccontextmanager
+    async def _tracked(self, record_latency: bool = False):
+        self.requests += 1
+        started = time.monotonic()
+        try:
+            yield
+        except (LLMOverloaded, asyncio.CancelledError):
+            raise  # our own load shedding / a cancelled hedge is not the provider's fault
+        except Exception:
+            self._record_failure()
+            raise
+        self._record_success(time.monotonic() - started if record_latency else None)
+
+    async def complete(self, prompt: str, completion_tokens: int, record_latency: bool = True) -> dict:
+        """One JSON completion. Pass ``record_latency=False`` for calls that aren't
+        single-word lookups (batches), so they don't skew the hedge delay."""
+        async with self._tracked(record_latency):
+            for attempt in range(2):
+                async with self._governed(prompt, completion_tokens) as estimate:
+                    try:
+                        resp = await self.client.chat.completions.create(
+                            model=self.model,
+                            messages=[{"role": "user", "content": prompt}],
+                            response_format={"type": "json_object"}
+                        )
+                    except Exception as e:
+                        if not _is_rate_limit(e) or attempt:
+                            raise
+                        self.governor.pause(_retry_after(e))
+                        continue  # queue again; the governor waits out the Retry-After
+
+                if resp.usage:
+                    self.governor.settle(estimate, resp.usage.total_tokens)
+                return json.loads(resp.choices[0].message.content)
+
+    async def stream(
+        self,
+        prompt: str,
+        completion_tokens: int,
+        on_partial: Callable[[dict], Awaitable[None]],
+        claim: Callable[[], bool] | None = None,
+    ) -> dict:
+        """Stream one JSON answer, calling ``on_partial`` as fields complete.
+
+        ``claim`` is called when the first content arrives; if it returns False
+        another provider's stream won a hedge and this one stops.
+        """
+        async with self._tracked(), self._governed(prompt, completion_tokens):
+            started = time.monotonic()
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    response_format={"type": "json_object"},
+                    stream=True,
+                )
+            except Exception as e:
+                if _is_rate_limit(e):
+                    self.governor.pause(_retry_after(e))
+                raise
+
+            text = ""
+            fields_seen = 0
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                if not text:
+                    self.first_token.observe(time.monotonic() - started)
+                    if claim is not None and not claim():
+                        raise asyncio.CancelledError  # lost the hedge
+                text += chunk.choices[0].delta.content
+
+                fields = parse_partial_object(text)
+                if len(fields) > fields_seen:
+                    fields_seen = len(fields)
+                    try:
+                        await on_partial(fields)
+                    except Exception as e:
+                        print(f"Partial callback error: {e}")  # never lose the answer over a UI edit
+
+            return json.loads(text)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "model": self.model,
+            "healthy": self.healthy,
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_p50": self.latency.percentile(0.50),
+            "latency_p95": self.latency.percentile(0.95),
+            "first_token_p95": self.first_token.percentile(0.95),
+            "hedge_delay": self.hedge_delay(),
+            "stream_hedge_delay": self.hedge_delay(streaming=True),
+            **self.governor.stats(),
+        }
+
+
+def _build_providers() -> list[Provider]:
+    providers = [
+        Provider(
+            "openai",
+            AsyncOpenAI(api_key=settings.OPENAI_API_KEY.get_secret_value(), base_url=settings.OPENAI_BASE_URL),
+            settings.OPENAI_MODEL,
+        ),
+    ]
+    if settings.GROQ_API_KEY is not None:
+        providers.append(Provider(
+            "groq",
+            AsyncGroq(api_key=settings.GROQ_API_KEY.get_secret_value(), base_url=settings.GROQ_BASE_URL),
+            settings.GROQ_MODEL,
+        ))
+    return providers
+
+
+providers = _build_providers()
+
+
+def ordered_providers() -> list[Provider]:
+    """Healthy providers first, in configured order; downed ones only as a last resort."""
+    return sorted(providers, key=lambda p: not p.healthy)
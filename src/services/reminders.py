@@ -0,0 +1,192 @@
+import asyncio
+import time
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+
+from ..config import settings
+from ..core import bot
+from ..database import (
+    mark_user_inactive,
+    last_active,
+    prune_last_active,
+    iter_due_users,
+    get_due_users,
+    count_due_cards,
+    mark_reminded,
+)
+from ..keyboards import main_menu_kb
+from ..utils.governor import TokenBucket
+
+# ─── CONFIG ──────────────────────────────────────────────
+MARK_BATCH = 100             # reminded users per last_reminded UPDATE
+DEFERRED_RECHECK = 500       # deferred users re-read per query
+# ─────────────────────────────────────────────────────────
+
+# Each tick reads only users whose next_due passed since the previous tick.
+# Every REMINDER_RESCAN seconds (and on startup) a tick instead reads everyone
+# due who wasn't reminded in the last REMINDER_MIN_GAP: next_due is the oldest
+# card, so after a partial review it can stay behind the watermark for good.
+# Users who can't be reminded yet (quiet hours, using the bot, reminded
+# recently) wait here until the given unix time and are then re-checked.
+_deferred: dict[int, int] = {}
+_queue: asyncio.Queue[int] = asyncio.Queue(maxsize=1000)
+# Queued or sent but not yet marked in users.last_reminded: a rescan must
+# not queue them again
+_queued: set[int] = set()
+_watermark = 0
+_last_rescan = 0
+_reminder_stats = {
+    "ticks": 0, "rescans": 0, "due": 0, "sent": 0, "quiet": 0, "busy": 0,
+    "too_soon": 0, "nothing_due": 0, "blocked": 0, "failed": 0,
+}
+
+
+def _quiet_until(now: int, utc_offset: int | None) -> int | None:
+    """End of the user's quiet hours as a unix time, or None if it's daytime for them."""
+    offset = (settings.REMINDER_UTC_OFFSET if utc_offset is None else utc_offset) * 60
+    local = now + offset
+    hour = local // 3600 % 24
+    start, end = settings.REMINDER_QUIET_START, settings.REMINDER_QUIET_END
+    quiet = start <= hour or hour < end if start > end else start <= hour < end
+    if not quiet:
+        return None
+    midnight = local - local % 86400
+    wake = midnight + end * 3600 + (86400 if hour >= end else 0)
+    return wake - offset
+
+
+async def _consider(user_id: int, last_reminded: int | None, utc_offset: int | None, now: int):
+    if user_id in _queued:
+        return
+    retry_at = 0
+    if last_reminded and now - last_reminded < settings.REMINDER_MIN_GAP:
+        retry_at, reason = last_reminded + settings.REMINDER_MIN_GAP, "too_soon"
+    elif now - last_active(user_id) < settings.REMINDER_IDLE:
+        retry_at, reason = last_active(user_id) + settings.REMINDER_IDLE, "busy"
+    elif (quiet_end := _quiet_until(now, utc_offset)) is not None:
+        retry_at, reason = quiet_end, "quiet"
+
+    if retry_at:
+        _deferred[user_id] = retry_at
+        _reminder_stats[reason] += 1
+    else:
+        _queued.add(user_id)
+        await _queue.put(user_id)  # waits while the sender is behind
+
+
+async def _tick(now: int):
+    global _watermark, _last_rescan
+    _reminder_stats["ticks"] += 1
+    prune_last_active(now - settings.REMINDER_IDLE)   # idle long enough to remind anyway
+
+    rescan = now - _last_rescan >= settings.REMINDER_RESCAN
+    if rescan:
+        pages = iter_due_users(now, reminded_before=now - settings.REMINDER_MIN_GAP)
+    else:
+        pages = iter_due_users(now, after=_watermark)
+    async for rows in pages:
+        _reminder_stats["due"] += len(rows)
+        for user_id, _, last_reminded, utc_offset in rows:
+            await _consider(user_id, last_reminded, utc_offset, now)
+        if not rescan:
+            # Page done: a failure later in the tick won't rescan it. Rows that
+            # share its last next_due may continue on the next page, so stop
+            # one second short of it (_queued and _deferred absorb the repeats).
+            _watermark = rows[-1][1] - 1
+    _watermark = now
+    if rescan:
+        _last_rescan = now
+        _reminder_stats["rescans"] += 1
+
+    ready = [user_id for user_id, at in _deferred.items() if at <= now]
+    for i in range(0, len(ready), DEFERRED_RECHECK):
+        chunk = ready[i:i + DEFERRED_RECHECK]
+        for user_id in chunk:
+            del _deferred[user_id]
+        # reviewed in the meantime, or went inactive: they just drop out here
+        for user_id, _, last_reminded, utc_offset in await get_due_users(chunk, now, now - settings.REMINDER_MIN_GAP):
+            await _consider(user_id, last_reminded, utc_offset, now)
+
+
+async def _send(user_id: int) -> bool:
+    now = int(time.time())
+    due = await count_due_cards(user_id, now)
+    if not due:
+        _reminder_stats["nothing_due"] += 1
+        return False
+
+    text = (
+        f"🔔 <b>{due} word{'s' if due > 1 else ''} waiting for review</b>\n\n"
+        "<i>A few minutes now keeps them from slipping away.</i>"
+    )
+    for attempt in range(2):
+        try:
+            await bot.send_message(user_id, text, reply_markup=main_menu_kb(), parse_mode="HTML")
+            _reminder_stats["sent"] += 1
+            return True
+        except TelegramRetryAfter as e:
+            if attempt:
+                break
+            await asyncio.sleep(e.retry_after)
+        except TelegramForbiddenError:
+            print(f"User {user_id} blocked the bot, marking as inactive.")
+            await mark_user_inactive(user_id)
+            _reminder_stats["blocked"] += 1
+            return False
+        except Exception as e:
+            print(f"Reminder to {user_id} failed: {e}")
+            break
+    _reminder_stats["failed"] += 1
+    return False
+
+
+async def _run_sender():
+    """Send queued reminders no faster than REMINDER_RATE per second."""
+    bucket = TokenBucket(settings.REMINDER_RATE * 60)
+    bucket.tokens = 1   # no initial burst: start at the steady rate
+    reminded: list[int] = []
+    try:
+        while True:
+            user_id = await _queue.get()
+            await asyncio.sleep(bucket.delay_for(1))
+            bucket.consume(1)
+            if await _send(user_id):
+                reminded.append(user_id)
+            else:
+                _queued.discard(user_id)
+            if reminded and (len(reminded) >= MARK_BATCH or _queue.empty()):
+                try:
+                    await mark_reminded(reminded, int(time.time()))
+                    _queued.difference_update(reminded)
+                    reminded.clear()
+                except Exception as e:
+                    print(f"Reminder bookkeeping error: {e}")
+    finally:
+        if reminded:   # shutting down: mark them, or they'd be reminded again after the restart
+            try:
+                await mark_reminded(reminded, int(time.time()))
+            except Exception as e:
+                print(f"Reminder bookkeeping error: {e}")
+
+
+async def run_reminders():
+    """Every REMINDER_INTERVAL seconds, queue a reminder for users whose cards came due."""
+    sender = asyncio.create_task(_run_sender())
+    try:
+        while True:
+            try:
+                await _tick(int(time.time()))
+            except Exception as e:
+                print(f"Reminder scheduler error: {e}")
+            await asyncio.sleep(settings.REMINDER_INTERVAL)
+    finally:
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)   # let it mark who it reminded
+
+
+def get_reminder_stats() -> dict:
+    return {
+        **_reminder_stats,
+        "deferred": len(_deferred),
+        "queued": len(_queued),
+    }
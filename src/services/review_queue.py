@@ -0,0 +1,91 @@
+from ..config import settings
+from ..database import get_due_cards, get_study_details
+
+# A review session keeps a small queue of due cards in the user's FSM data
+# and reads the next keyset page only when it runs out, instead of loading
+# every due word for every card.
+#
+# FSM keys:
+#   review_queue   [[id, word, level, pronunciation], ...] in due order
+#   review_cursor  [next_review, id] of the last card fetched
+#   failed_words   ids graded "again" this session (re-learning round)
+QUEUE_KEY = "review_queue"
+CURSOR_KEY = "review_cursor"
+FAILED_KEY = "failed_words"
+
+_queue_stats = {"pages": 0, "cards": 0, "sessions": 0}
+
+
+def reset_queue(data: dict):
+    """Start reading the due cards from the top again (a new review session)."""
+    data[QUEUE_KEY] = []
+    data[CURSOR_KEY] = None
+    _queue_stats["sessions"] += 1
+
+
+async def _refill(user_id: int, data: dict) -> bool:
+    """Append the next page of due cards; False when nothing new is due."""
+    cursor = data.get(CURSOR_KEY)
+    rows = await get_due_cards(user_id, tuple(cursor) if cursor else None, settings.QUIZ_PAGE_SIZE)
+    _queue_stats["pages"] += 1
+    if not rows:
+        return False
+
+    queue = data.setdefault(QUEUE_KEY, [])
+    queued = {card[0] for card in queue}
+    for word_id, next_review, word, level, pronunciation in rows:
+        if word_id not in queued:
+            queue.append([word_id, word, level, pronunciation])
+    data[CURSOR_KEY] = [rows[-1][1], rows[-1][0]]
+    return True
+
+
+async def next_card(user_id: int, data: dict) -> tuple[list | None, bool]:
+    """The card to show next and whether it belongs to the re-learning round.
+
+    Same priorities as before: due cards not failed this session, then due
+    cards that were failed, then failed cards that are not due yet. Words
+    that become due during the session are picked up by the next refill,
+    because the keyset cursor only moves forward in due time.
+    """
+    failed: list[int] = data.setdefault(FAILED_KEY, [])
+    queue: list[list] = data.setdefault(QUEUE_KEY, [])
+
+    # PRIORITY 1: due cards not failed this session (read ahead as needed)
+    while True:
+        for card in queue:
+            if card[0] not in failed:
+                _queue_stats["cards"] += 1
+                return card, False
+        if not await _refill(user_id, data):
+            break
+
+    # PRIORITY 2: due cards that are also in the failed list
+    if queue:
+        _queue_stats["cards"] += 1
+        return queue[0], True
+
+    # PRIORITY 3: failed cards not yet due
+    while failed:
+        result = await get_study_details(failed[0])
+        if result:
+            user_word, entry = result
+            _queue_stats["cards"] += 1
+            return [user_word.id, entry.word, entry.level, entry.pronunciation], True
+        failed.pop(0)  # removed from the study list meanwhile
+
+    return None, False
+
+
+def queue_fields(data: dict) -> dict:
+    """Just the FSM keys owned by the review session, for ``state.update_data``."""
+    return {key: data[key] for key in (QUEUE_KEY, CURSOR_KEY, FAILED_KEY) if key in data}
+
+
+def drop_card(data: dict, word_id: int):
+    """A graded card leaves the queue; the cursor brings it back once it is due again."""
+    data[QUEUE_KEY] = [card for card in data.get(QUEUE_KEY, []) if card[0] != word_id]
+
+
+def get_review_queue_stats() -> dict:
+    return dict(_queue_stats)
@@ -1,15 +1,134 @@
+import asyncio
 import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from gtts import gTTS
 
+from ..config import settings
+from ..utils import Histogram, Overloaded, SingleFlight
+from ..utils.blobstore import BlobStore
+
+# Generated speech is kept on disk keyed by (text, lang, tld), so gTTS runs
+# at most once per word on this machine
+_store = BlobStore(settings.AUDIO_STORE_DIR, settings.AUDIO_STORE_MAX_MB * 1024 * 1024, suffix=".mp3")
+_generating = SingleFlight()
+
+# gTTS blocks on HTTP; it gets its own pool so a burst of taps can't take
+# over the default executor (used by asyncio.to_thread and friends)
+_executor = ThreadPoolExecutor(max_workers=settings.TTS_WORKERS, thread_name_prefix="tts")
+_pending = 0   # jobs queued or running in _executor
+_queue_wait = Histogram()
+_synthesis_time = Histogram()
+_tts_counters = {"synthesized": 0, "failed": 0, "shed": 0}
+
+
+class TTSOverloaded(Overloaded):
+    """Too many TTS jobs are already waiting; try again shortly."""
+
+
+def _synthesize(text: str, lang: str, tld: str) -> bytes:
+    tts = gTTS(text=text, lang=lang, tld=tld)
+    buf = io.BytesIO()
+    tts.write_to_fp(buf)
+    return buf.getvalue()
+
+
+def _timed_job(digest: str, text: str, lang: str, tld: str, submitted: float) -> Path:
+    started = time.monotonic()
+    _queue_wait.observe(started - submitted)
+    data = _synthesize(text, lang, tld)
+    _synthesis_time.observe(time.monotonic() - started)
+    return _store.put(digest, data)
+
+
+async def _generate_and_store(digest: str, text: str, lang: str, tld: str) -> Path:
+    global _pending
+    if _pending >= settings.TTS_WORKERS + settings.TTS_MAX_QUEUE:
+        _tts_counters["shed"] += 1
+        raise TTSOverloaded(f"{_pending} TTS jobs pending")
+
+    _pending += 1
+    try:
+        path = await asyncio.get_running_loop().run_in_executor(
+            _executor, _timed_job, digest, text, lang, tld, time.monotonic()
+        )
+    except Exception:
+        _tts_counters["failed"] += 1
+        raise
+    finally:
+        _pending -= 1
+    _tts_counters["synthesized"] += 1
+    return path
+
+
+async def tts_path(text: str, lang: str = "en", tld: str = "us") -> Path:
+    """Path of the stored audio for ``text``, generating it on first use.
+
+    Concurrent requests for the same text share one synthesis. Raises
+    ``TTSOverloaded`` when the TTS queue is full.
+    """
+    digest = BlobStore.digest(text, lang, tld)
+    path = await asyncio.to_thread(_store.get_path, digest)
+    if path is not None:
+        return path
+    return await _generating.do(digest, _generate_and_store, digest, text, lang, tld)
+
 
 async def generate_tts(text: str, lang: str = "en", tld: str = "us") -> bytes:
-    def _generate():
-        tts = gTTS(text=text, lang=lang, tld=tld)
-        buf = io.BytesIO()
-        tts.write_to_fp(buf)
-        buf.seek(0)
-        return buf.read()
-
-    import asyncio
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, _generate)
\ No newline at end of file
+    path = await tts_path(text, lang, tld)
+    return await asyncio.to_thread(path.read_bytes)
+
+
+async def generate_tts_batch(
+    texts: list[str],
+    lang: str = "en",
+    tld: str = "us",
+    concurrency: int | None = None,
+) -> dict[str, Path | None]:
+    """Synthesize many texts for pre-warming; failures map to ``None``.
+
+    Runs at most ``concurrency`` jobs at once (default: half the TTS workers)
+    so interactive taps still find a free worker, and waits instead of
+    being shed when the queue is full.
+    """
+    limiter = asyncio.Semaphore(concurrency or max(1, settings.TTS_WORKERS // 2))
+
+    async def one(text: str) -> Path | None:
+        async with limiter:
+            while True:
+                try:
+                    return await tts_path(text, lang, tld)
+                except TTSOverloaded:
+                    await asyncio.sleep(0.5)
+                except Exception as e:
+                    print(f"TTS error for '{text}': {e}")
+                    return None
+
+    texts = list(dict.fromkeys(texts))
+    return dict(zip(texts, await asyncio.gather(*(one(t) for t in texts))))
+
+
+def tts_has_capacity() -> bool:
+    """Whether a TTS worker is free right now (background work checks this first)."""
+    return _pending < settings.TTS_WORKERS
+
+
+def has_tts(text: str, lang: str = "en", tld: str = "us") -> bool:
+    return BlobStore.digest(text, lang, tld) in _store
+
+
+async def load_audio_store() -> int:
+    return await asyncio.to_thread(_store.load)
+
+
+def get_audio_store_stats() -> dict:
+    return {
+        **_store.stats(),
+        **_tts_counters,
+        "pending": _pending,
+        "workers": settings.TTS_WORKERS,
+        "coalesced": _generating.coalesced,
+        "queue_wait": _queue_wait.stats(),
+        "synthesis": _synthesis_time.stats(),
+    }
@@ -1,11 +1,22 @@
 import bs4
 import aiohttp
 import asyncio
+import re
 from typing import Optional
 
-DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; Win64; x64)'}
+from ..config import settings
+from ..utils import SingleFlight, TTLCache
+from .http import http_session
+
 LINK_PREFIX = "https://dictionary.cambridge.org"
 
+_ENTRY_START = re.compile(r'<div class="[^"]*\bentry-body__el\b')
+_HEADER_START = re.compile(r'<div class="[^"]*\bdpos-h\b')
+
+# Audio links rarely change; one scrape per word per day is plenty
+_links_cache = TTLCache(settings.WORD_AUDIO_CACHE_SIZE, settings.WORD_AUDIO_CACHE_TTL)
+_scrapes = SingleFlight()
+
 
 def parse_audio_links(header_block: Optional[bs4.Tag]) -> tuple[list[str], list[str]]:
     uk_audio_links: list[str] = []
@@ -31,6 +42,34 @@ def parse_audio_links(header_block: Optional[bs4.Tag]) -> tuple[list[str], list[
     return uk_audio_links, us_audio_links
 
 
+def extract_audio_links(content: bytes | str) -> tuple[list[str], list[str]]:
+    """UK and US audio links from the header block of every entry on a page.
+
+    Instead of building a tree for the whole page (hundreds of KB), each
+    entry's first ``dpos-h`` header is cut out as a string and only that
+    small fragment is handed to BeautifulSoup.
+    """
+    html = content.decode("utf-8", errors="replace") if isinstance(content, bytes) else content
+
+    uk_links: list[str] = []
+    us_links: list[str] = []
+
+    starts = [m.start() for m in _ENTRY_START.finditer(html)]
+    for begin, end in zip(starts, starts[1:] + [len(html)]):
+        header = _HEADER_START.search(html, begin, end)
+        if header is None:
+            continue
+        stop = html.find('class="pos-body', header.end(), end)
+        fragment = html[header.start():stop if stop != -1 else end]
+
+        header_block = bs4.BeautifulSoup(fragment, "html.parser").find("div", {"class": "dpos-h"})
+        uk, us = parse_audio_links(header_block)
+        uk_links.extend(uk)
+        us_links.extend(us)
+
+    return list(dict.fromkeys(uk_links)), list(dict.fromkeys(us_links))
+
+
 async def get_word_audio(
     word: str,
     session: aiohttp.ClientSession,
@@ -40,28 +79,31 @@ async def get_word_audio(
     async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
         content = await response.read()
 
-    soup = bs4.BeautifulSoup(content, "html.parser")
-
-    uk_links: list[str] = []
-    us_links: list[str] = []
-
-    for entry in soup.find_all("div", {"class": lambda x: x and "entry-body__el" in x}):
-        header_block = entry.find("div", {"class": "dpos-h"})
-        uk, us = parse_audio_links(header_block)
-        uk_links.extend(uk)
-        us_links.extend(us)
+    # Still a few ms of pure Python per page: keep it off the event loop
+    uk_links, us_links = await asyncio.to_thread(extract_audio_links, content)
 
     return {
         "word": word,
-        "uk": list(dict.fromkeys(uk_links)),
-        "us": list(dict.fromkeys(us_links)),
+        "uk": uk_links,
+        "us": us_links,
     }
 
 
+async def _scrape(word: str) -> dict[str, list[str]]:
+    result = await get_word_audio(word, await http_session())
+    _links_cache.set(word, result)
+    print(f"Audio links for '{word}': {result}")
+    return result
+
+
 async def get(word: str) -> dict[str, list[str]]:
-    async with aiohttp.ClientSession(headers=DEFAULT_HEADERS) as session:
-        result = await get_word_audio(word, session)
-        print(f"Audio links for '{word}': {result}")
-        return result
+    cached = _links_cache.get(word)
+    if cached is not None:
+        return cached
+    return await _scrapes.do(word, _scrape, word)
+
+
+def get_word_audio_stats() -> dict:
+    return {**_links_cache.stats(), "scrapes": _scrapes.executed, "coalesced": _scrapes.coalesced}
 
 
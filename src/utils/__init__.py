@@ -0,0 +1,12 @@
+from .cache import TTLCache
+from .governor import RateGovernor, Overloaded
+from .metrics import Histogram
+from .singleflight import SingleFlight
+
+__all__ = [
+    "TTLCache",
+    "RateGovernor",
+    "Overloaded",
+    "Histogram",
+    "SingleFlight",
+]
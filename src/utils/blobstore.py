@@ -0,0 +1,123 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+class BlobStore:
+    """Content-addressed files on local disk with a total size cap.
+
+    Keys are hashed into two levels of shard directories (``ab/cd/abcd….mp3``)
+    so no directory grows huge. Writes go to a temp file that is renamed into
+    place, so readers never see half a file. When the store grows past
+    ``max_bytes`` the least recently used files are deleted; file mtimes are
+    the LRU clock, so the order survives restarts.
+
+    The methods do blocking file I/O; call them from a thread (``asyncio.to_thread``).
+    They are thread-safe.
+    """
+
+    def __init__(self, root: str | os.PathLike, max_bytes: int, suffix: str = ""):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._files: OrderedDict[str, int] = OrderedDict()   # digest -> size, oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(*parts: str) -> str:
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / f"{digest}{self.suffix}"
+
+    def load(self) -> int:
+        """Index what is already on disk; returns the number of files."""
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.startswith(".tmp-"):
+                    os.unlink(os.path.join(dirpath, name))  # left behind by a crash mid-write
+                    continue
+                if not name.endswith(self.suffix) or name.startswith("."):
+                    continue
+                st = os.stat(os.path.join(dirpath, name))
+                found.append((st.st_mtime, name[:len(name) - len(self.suffix)] if self.suffix else name, st.st_size))
+
+        with self._lock:
+            self._files.clear()
+            for _, digest, size in sorted(found):
+                self._files[digest] = size
+            self.total_bytes = sum(self._files.values())
+            self._evict()
+            return len(self._files)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._files
+
+    def get_path(self, digest: str) -> Path | None:
+        """Path of a stored blob (for sendfile / FSInputFile), marking it recently used."""
+        with self._lock:
+            if digest not in self._files:
+                self.misses += 1
+                return None
+            path = self.path(digest)
+            try:
+                os.utime(path)
+            except FileNotFoundError:  # removed behind our back
+                self.total_bytes -= self._files.pop(digest)
+                self.misses += 1
+                return None
+            self._files.move_to_end(digest)
+            self.hits += 1
+            return path
+
+    def put(self, digest: str, data: bytes) -> Path:
+        path = self.path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)  # atomic on POSIX and Windows
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self.total_bytes += len(data) - self._files.pop(digest, 0)
+            self._files[digest] = len(data)
+            self.writes += 1
+            self._evict()
+        return path
+
+    def _evict(self):
+        # caller holds the lock
+        while self.total_bytes > self.max_bytes and len(self._files) > 1:
+            digest, size = self._files.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.unlink(self.path(digest))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self._files),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
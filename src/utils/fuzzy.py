@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal-string-alignment distance (adjacent swaps cost 1).
+
+    Gives up early and returns ``max_distance + 1`` once the distance is
+    known to exceed ``max_distance``.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    prev2: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+            row_min = min(row_min, v)
+        if row_min > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class FuzzyIndex:
+    """Symmetric-delete spelling index (the SymSpell approach).
+
+    Every word is stored under all strings reachable by deleting up to
+    ``max_distance`` characters from its first ``prefix_length`` letters.
+    A query generates the same deletes and only the handful of words that
+    share one of them are checked with a real edit distance, so lookups
+    stay in the low milliseconds with tens of thousands of headwords.
+    """
+
+    def __init__(self, words=(), max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words: set[str] = set()
+        self._deletes: defaultdict[str, list[str]] = defaultdict(list)
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _variants(self, word: str, max_distance: int) -> set[str]:
+        word = word[:self.prefix_length]
+        variants = {word}
+        frontier = {word}
+        for _ in range(max_distance):
+            frontier = {
+                w[:i] + w[i + 1:]
+                for w in frontier if len(w) > 1
+                for i in range(len(w))
+            }
+            variants |= frontier
+        return variants
+
+    def add(self, word: str):
+        if not word or word in self.words:
+            return
+        self.words.add(word)
+        for variant in self._variants(word, self.max_distance):
+            self._deletes[variant].append(word)
+
+    def lookup(self, word: str, max_distance: int | None = None, limit: int = 3) -> list[tuple[int, str]]:
+        """Closest indexed words as ``(distance, word)``, best first."""
+        if max_distance is None:
+            max_distance = self.max_distance
+        max_distance = min(max_distance, self.max_distance)
+
+        candidates: set[str] = set()
+        for variant in self._variants(word, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+        candidates.discard(word)
+
+        matches = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, abs(len(candidate) - len(word)), candidate))
+        matches.sort()
+        return [(distance, candidate) for distance, _, candidate in matches[:limit]]
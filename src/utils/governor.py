@@ -0,0 +1,127 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from .metrics import Histogram
+
+
+class Overloaded(Exception):
+    """The governor shed this request instead of queueing it."""
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= amount  # may go negative to settle a late usage report
+
+
+class RateGovernor:
+    """Caps concurrency, requests/min and tokens/min for an upstream API.
+
+    Callers queue for a slot until ``queue_timeout``; when more than
+    ``max_queue`` are already waiting, or the budget cannot be met before the
+    deadline, ``Overloaded`` is raised straight away so the user can be told
+    to retry instead of hanging.
+    """
+
+    def __init__(self, max_concurrent: int, rpm: int, tpm: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._paused_until = 0.0
+
+        self.waiting = 0
+        self.active = 0
+        self.shed = 0
+        self.throttled = 0
+        self.wait_time = Histogram()
+
+    def pause(self, seconds: float):
+        """Honour a provider's Retry-After: nobody starts a request before then."""
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        self._tokens.consume(actual_tokens - estimated_tokens)
+
+    def _shed(self, reason: str):
+        self.shed += 1
+        raise Overloaded(reason)
+
+    async def _acquire(self, tokens: int, deadline: float):
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self._shed("timed out waiting for a free slot")
+
+        try:
+            while True:
+                now = time.monotonic()
+                delay = max(
+                    self._paused_until - now,
+                    self._requests.delay_for(1),
+                    self._tokens.delay_for(tokens),
+                )
+                if delay <= 0:
+                    break
+                if now + delay > deadline:
+                    self._shed("rate budget exhausted")
+                await asyncio.sleep(delay)
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 1):
+        if self.waiting >= self.max_queue:
+            self._shed("queue is full")
+
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._acquire(tokens, started + self.queue_timeout)
+        finally:
+            self.waiting -= 1
+        self.wait_time.observe(time.monotonic() - started)
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        wait = self.wait_time.stats()
+        return {
+            "active": self.active,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self.waiting,
+            "shed": self.shed,
+            "throttled": self.throttled,
+            "wait_p50": wait["p50"],
+            "wait_p95": wait["p95"],
+            "wait_buckets": wait["buckets"],
+        }
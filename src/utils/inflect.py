@@ -0,0 +1,169 @@
+import re
+
+# Rule-based English inflection generator used to build the lemma index
+# offline. Over-generating a non-word is harmless (nobody searches for it);
+# mapping a real headword to a different lemma is not, so build_lemma_index
+# never maps a form that is itself in the word list.
+
+VOWELS = set("aeiou")
+
+# lemma: past, past participle (space separated alternatives with "/")
+IRREGULAR_VERBS = """
+arise arose arisen|awake awoke awoken|be was/were been|bear bore borne/born|beat beat beaten|
+become became become|begin began begun|bend bent bent|bet bet bet|bind bound bound|bite bit bitten|
+bleed bled bled|blow blew blown|break broke broken|breed bred bred|bring brought brought|
+build built built|burn burnt/burned burnt/burned|burst burst burst|buy bought bought|catch caught caught|
+choose chose chosen|cling clung clung|come came come|cost cost cost|creep crept crept|cut cut cut|
+deal dealt dealt|dig dug dug|do did done|draw drew drawn|dream dreamt/dreamed dreamt/dreamed|
+drink drank drunk|drive drove driven|eat ate eaten|fall fell fallen|feed fed fed|feel felt felt|
+fight fought fought|find found found|flee fled fled|fling flung flung|fly flew flown|forbid forbade forbidden|
+forecast forecast forecast|forget forgot forgotten|forgive forgave forgiven|freeze froze frozen|
+get got got/gotten|give gave given|go went gone|grind ground ground|grow grew grown|hang hung hung|
+have had had|hear heard heard|hide hid hidden|hit hit hit|hold held held|hurt hurt hurt|keep kept kept|
+kneel knelt knelt|know knew known|lay laid laid|lead led led|lean leant/leaned leant/leaned|
+leap leapt/leaped leapt/leaped|learn learnt/learned learnt/learned|leave left left|lend lent lent|
+let let let|lie lay lain|light lit lit|lose lost lost|make made made|mean meant meant|meet met met|
+mislead misled misled|mistake mistook mistaken|overcome overcame overcome|pay paid paid|prove proved proven|
+put put put|quit quit quit|read read read|ride rode ridden|ring rang rung|rise rose risen|run ran run|
+say said said|see saw seen|seek sought sought|sell sold sold|send sent sent|set set set|sew sewed sewn|
+shake shook shaken|shed shed shed|shine shone shone|shoot shot shot|show showed shown|shrink shrank shrunk|
+shut shut shut|sing sang sung|sink sank sunk|sit sat sat|sleep slept slept|slide slid slid|
+sling slung slung|smell smelt/smelled smelt/smelled|speak spoke spoken|speed sped sped|
+spell spelt/spelled spelt/spelled|spend spent spent|spill spilt/spilled spilt/spilled|spin spun spun|
+spit spat spat|split split split|spoil spoilt/spoiled spoilt/spoiled|spread spread spread|spring sprang sprung|
+stand stood stood|steal stole stolen|stick stuck stuck|sting stung stung|stink stank stunk|
+stride strode stridden|strike struck struck|string strung strung|strive strove striven|swear swore sworn|
+sweep swept swept|swell swelled swollen|swim swam swum|swing swung swung|take took taken|teach taught taught|
+tear tore torn|tell told told|think thought thought|throw threw thrown|thrust thrust thrust|
+tread trod trodden|understand understood understood|undertake undertook undertaken|upset upset upset|
+wake woke woken|wear wore worn|weave wove woven|weep wept wept|win won won|wind wound wound|
+withdraw withdrew withdrawn|wring wrung wrung|write wrote written
+"""
+
+IRREGULAR_NOUNS = """
+man men|woman women|child children|foot feet|tooth teeth|goose geese|mouse mice|louse lice|person people|
+ox oxen|leaf leaves|loaf loaves|knife knives|life lives|wife wives|half halves|calf calves|wolf wolves|
+shelf shelves|thief thieves|self selves|sheaf sheaves|analysis analyses|basis bases|crisis crises|
+diagnosis diagnoses|hypothesis hypotheses|thesis theses|oasis oases|parenthesis parentheses|
+phenomenon phenomena|criterion criteria|cactus cacti|fungus fungi|nucleus nuclei|stimulus stimuli|
+syllabus syllabi|radius radii|medium media|curriculum curricula|bacterium bacteria|appendix appendices|
+index indices|matrix matrices|vertex vertices|axis axes|formula formulae|antenna antennae|die dice
+"""
+
+IRREGULAR_ADJECTIVES = """
+good better best|bad worse worst|far farther/further farthest/furthest|little less least|many more most|
+much more most|ill worse worst
+"""
+
+
+def _parse_table(table: str) -> dict[str, list[str]]:
+    forms: dict[str, list[str]] = {}
+    for entry in table.replace("\n", "").split("|"):
+        parts = entry.split()
+        if not parts:
+            continue
+        lemma, rest = parts[0], parts[1:]
+        forms[lemma] = [f for part in rest for f in part.split("/")]
+    return forms
+
+
+_IRREGULAR_VERB_LEMMAS = set(_parse_table(IRREGULAR_VERBS))
+_IRREGULAR: dict[str, list[str]] = {}
+for _table in (IRREGULAR_VERBS, IRREGULAR_NOUNS, IRREGULAR_ADJECTIVES):
+    for _lemma, _forms in _parse_table(_table).items():
+        _IRREGULAR.setdefault(_lemma, []).extend(_forms)
+
+
+def _is_consonant(ch: str) -> bool:
+    return ch.isalpha() and ch not in VOWELS
+
+
+def _ends_cvc(word: str) -> bool:
+    """Short vowel + final consonant, e.g. run, stop, begin (→ doubling)."""
+    return (
+        len(word) >= 3
+        and _is_consonant(word[-1]) and word[-1] not in "wxy"
+        and word[-2] in VOWELS
+        and _is_consonant(word[-3])
+    )
+
+
+def _plural(word: str) -> set[str]:
+    if re.search(r"(s|x|z|ch|sh)$", word):
+        return {word + "es"}
+    if len(word) > 1 and word.endswith("y") and _is_consonant(word[-2]):
+        return {word[:-1] + "ies"}
+    if word.endswith("o"):
+        return {word + "s", word + "es"}
+    return {word + "s"}
+
+
+def _past(word: str) -> set[str]:
+    if word.endswith("e"):
+        return {word + "d"}
+    if len(word) > 1 and word.endswith("y") and _is_consonant(word[-2]):
+        return {word[:-1] + "ied"}
+    forms = {word + "ed"}
+    if _ends_cvc(word):
+        forms.add(word + word[-1] + "ed")
+    return forms
+
+
+def _gerund(word: str) -> set[str]:
+    if word.endswith("ie"):
+        return {word[:-2] + "ying"}
+    if re.search(r"(ee|ye|oe)$", word):
+        return {word + "ing"}
+    if word.endswith("e") and len(word) > 2:
+        return {word[:-1] + "ing"}
+    forms = {word + "ing"}
+    if _ends_cvc(word):
+        forms.add(word + word[-1] + "ing")
+    return forms
+
+
+def inflections(lemma: str) -> set[str]:
+    """All surface forms generated for a lemma (excluding the lemma itself)."""
+    lemma = lemma.lower().strip()
+    if not lemma.isalpha() or len(lemma) < 2:
+        return set()
+
+    forms = _plural(lemma) | _gerund(lemma)
+    if lemma not in _IRREGULAR_VERB_LEMMAS:
+        forms |= _past(lemma)   # "see" must not produce "seed"
+    forms.update(_IRREGULAR.get(lemma, ()))
+    forms.discard(lemma)
+    return forms
+
+
+def build_lemma_index(lemmas) -> dict[str, str]:
+    """Map every inflected form to its lemma.
+
+    Forms that are headwords themselves are left alone (``saw``, ``found``,
+    ``left``), and forms produced by two different lemmas are dropped unless
+    one of them is an explicit irregular form.
+    """
+    headwords = {w.lower().strip() for w in lemmas if w and w.strip()}
+    index: dict[str, str] = {}
+    pinned: set[str] = set()      # irregular forms always win
+    ambiguous: set[str] = set()
+
+    for lemma in sorted(headwords):
+        irregular = set(_IRREGULAR.get(lemma, ()))
+        for form in inflections(lemma):
+            if form in headwords:
+                continue
+            if form in irregular:
+                index[form] = lemma
+                pinned.add(form)
+                continue
+            if form in pinned or form in ambiguous:
+                continue
+            owner = index.get(form)
+            if owner is None:
+                index[form] = lemma
+            elif owner != lemma:
+                del index[form]
+                ambiguous.add(form)
+
+    return index
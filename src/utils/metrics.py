@@ -0,0 +1,37 @@
+from bisect import bisect_left
+from collections import deque
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Bucketed latency histogram (seconds) plus a window of recent samples for percentiles."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, window: int = 1000):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self._recent.append(value)
+
+    def percentile(self, q: float) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> dict:
+        labels = [f"≤{b:g}s" for b in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
@@ -0,0 +1,28 @@
+import json
+import re
+
+# "key": "string" or "key": number, only once the value is complete
+_FIELD = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?(?=\s*[,}]))')
+
+
+def parse_partial_object(text: str) -> dict:
+    """Fields of a flat JSON object that have fully arrived so far.
+
+    Used while an LLM response is still streaming: strings and numbers are
+    returned as soon as their closing quote / delimiter shows up, anything
+    unfinished is left out.
+    """
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data
+    except ValueError:
+        pass
+
+    fields = {}
+    for match in _FIELD.finditer(text):
+        try:
+            fields[json.loads(f'"{match.group(1)}"')] = json.loads(match.group(2))
+        except ValueError:
+            continue
+    return fields
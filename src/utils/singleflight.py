@@ -0,0 +1,34 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Runs at most one call per key; concurrent callers share its result."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.executed = 0     # calls that actually ran
+        self.coalesced = 0    # calls that joined an in-flight one
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self.executed += 1
+            # Run the work in its own task so a cancelled caller
+            # does not cancel it for everybody else waiting on it.
+            task = asyncio.create_task(fn(*args, **kwargs))
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,195 @@
+"""Hedging, failover and the circuit breaker against local stub OpenAI/Groq servers."""
+import asyncio
+import json
+import os
+import socket
+import time
+
+import pytest
+from aiohttp import web
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+OPENAI_PORT, GROQ_PORT = _free_port(), _free_port()
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{OPENAI_PORT}/v1"
+os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{GROQ_PORT}"
+os.environ["GROQ_API_KEY"] = "test"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("BOT_TOKEN", "123456:TEST")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from src.services import llm, providers as providers_module  # noqa: E402  (env first)
+from src.utils import Histogram  # noqa: E402
+
+
+def _answer(source: str) -> dict:
+    return {"word": "apple", "definition": f"from {source}", "example": "An apple a day."}
+
+
+class Stub:
+    """A chat completions endpoint whose delay, status and answer each test sets."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.delay = 0.0
+        self.status = 200
+        self.answer = _answer(self.name)
+        self.requests = 0
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        body = await request.json()
+        await asyncio.sleep(self.delay)  # for streams: time to the first token
+        if self.status != 200:
+            return web.json_response({"error": {"message": "stub failure"}}, status=self.status)
+
+        content = json.dumps(self.answer)
+        if not body.get("stream"):
+            return web.json_response({
+                "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for i in range(0, len(content), 8):
+            chunk = {
+                "id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "delta": {"content": content[i:i + 8]}, "finish_reason": None}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(0.01)
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+
+@pytest.fixture(scope="module")
+def env():
+    loop = asyncio.new_event_loop()
+    stubs = {"openai": Stub("openai"), "groq": Stub("groq")}
+    runners = []
+    for stub, port in ((stubs["openai"], OPENAI_PORT), (stubs["groq"], GROQ_PORT)):
+        app = web.Application()
+        app.router.add_post("/{tail:.*}", stub.handle)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+        runners.append(runner)
+
+    yield loop, stubs
+
+    for runner in runners:
+        loop.run_until_complete(runner.cleanup())
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def fresh(env, monkeypatch):
+    _, stubs = env
+    for stub in stubs.values():
+        stub.reset()
+    for provider in providers_module.providers:
+        provider._consecutive_failures = 0
+        provider._down_until = 0.0
+        provider.latency = Histogram()
+        provider.first_token = Histogram()
+    for key in llm._hedge_counters:
+        llm._hedge_counters[key] = 0
+    monkeypatch.setattr(providers_module, "DEFAULT_HEDGE_DELAY", 0.3)
+    monkeypatch.setattr(llm.settings, "LLM_HEDGING", True)
+    monkeypatch.setattr(llm.settings, "LLM_STREAMING", True)
+
+
+def _provider(name: str) -> providers_module.Provider:
+    return next(p for p in providers_module.providers if p.name == name)
+
+
+def test_slow_primary_is_hedged(env):
+    loop, stubs = env
+    stubs["openai"].delay = 2.0
+
+    started = time.monotonic()
+    data = loop.run_until_complete(llm.get_definition("apple"))
+
+    assert data["definition"] == "from groq"
+    assert time.monotonic() - started < 1.5
+    assert llm._hedge_counters["hedged"] == 1
+    assert llm._hedge_counters["hedge_wins"] == 1
+
+
+def test_slow_stream_is_hedged_until_first_token(env):
+    loop, stubs = env
+    stubs["openai"].delay = 2.0
+    partials = []
+
+    async def on_partial(fields):
+        partials.append(dict(fields))
+
+    data = loop.run_until_complete(llm.get_definition("apple", on_partial=on_partial))
+
+    assert data["definition"] == "from groq"
+    assert llm._hedge_counters["hedge_wins"] == 1
+    assert partials and all(p.get("definition", "from groq") == "from groq" for p in partials)
+
+
+def test_unusable_fast_answer_does_not_beat_a_valid_one(env):
+    loop, stubs = env
+    stubs["openai"].delay = 0.5
+    stubs["openai"].answer = {"word": "apple", "definition": "no example"}
+    stubs["groq"].delay = 0.5   # hedged at 0.3s, answers after openai's broken one
+
+    data = loop.run_until_complete(llm.get_definition("apple"))
+
+    assert data["definition"] == "from groq"
+    assert llm._hedge_counters["hedge_wins"] == 1
+
+
+def test_failing_primary_fails_over(env):
+    loop, stubs = env
+    stubs["openai"].status = 400
+
+    data = loop.run_until_complete(llm.get_definition("apple"))
+
+    assert data["definition"] == "from groq"
+    assert llm._hedge_counters["failovers"] == 1
+    assert llm._hedge_counters["hedged"] == 0
+
+
+def test_circuit_breaker_opens_after_three_errors(env):
+    loop, stubs = env
+    stubs["openai"].status = 400
+
+    for _ in range(providers_module.FAILURES_BEFORE_DOWN):
+        assert loop.run_until_complete(llm.get_definition("apple"))["definition"] == "from groq"
+
+    assert not _provider("openai").healthy
+    assert providers_module.ordered_providers()[0].name == "groq"
+
+    loop.run_until_complete(llm.get_definition("apple"))
+    assert stubs["openai"].requests == providers_module.FAILURES_BEFORE_DOWN  # skipped while down
+
+
+def test_batch_items_are_matched_by_query_not_position(env):
+    loop, stubs = env
+    stubs["openai"].answer = {"items": [
+        # "apple" was skipped; "pear" lost its echo, "plum" echoes garbage
+        {**_answer("openai"), "word": "pear"},
+        {**_answer("openai"), "word": "Plum", "query": "plum?"},
+        {**_answer("openai"), "word": "figs", "query": "???"},
+    ]}
+
+    results = loop.run_until_complete(llm.get_definitions(["apple", "pear", "plum", "fig"]))
+
+    assert results["apple"] is None
+    assert results["pear"]["word"] == "pear"
+    assert results["plum"]["word"] == "Plum"
+    assert results["fig"] is None   # never saved under a headword we didn't ask for